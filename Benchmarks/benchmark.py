@@ -0,0 +1,252 @@
+# Times the plugin's hot paths on synthetic models and writes the results to JSON
+#
+#   python Benchmarks/benchmark.py --sizes 5000,20000 --output results.json --baseline old.json
+#   python Benchmarks/benchmark.py --blender /path/to/blender       (same scenarios under blender -b --python)
+#
+# On plain CPython bpy, mathutils and eos come from Benchmarks/stubs, inside Blender the real bpy is used
+# and only the synthetic models come from the stub eos module
+
+import sys
+import os
+import json
+import time
+import platform
+import argparse
+import subprocess
+import tracemalloc
+import tempfile
+import importlib.util
+
+benchmarkFolder = os.path.dirname(os.path.abspath(__file__))
+stubFolder = os.path.join(benchmarkFolder, "stubs")
+scriptFolder = os.path.join(os.path.dirname(benchmarkFolder), "Scripts")
+
+try:
+    import bpy
+    inBlender = True
+except ImportError:
+    sys.path.insert(0, stubFolder)
+    import bpy
+    inBlender = False
+
+import numpy as np
+
+def loadSyntheticEos(): # The stub eos module, loaded beside the real bindings when they exist
+
+    try:
+        import eos
+    except ImportError:
+        sys.path.insert(0, stubFolder)
+        import eos
+        return eos.morphablemodel
+
+    spec = importlib.util.spec_from_file_location("synthetic_eos", os.path.join(stubFolder, "eos.py"))
+    synthetic = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(synthetic)
+
+    realLoadModel = eos.morphablemodel.load_model
+    realLoadBlendshapes = eos.morphablemodel.load_blendshapes
+
+    def loadModel(path): # Synthetic specs go to the stub, everything else to eos
+        if(path.startswith("synthetic:")): return synthetic.load_model(path)
+        return realLoadModel(path)
+
+    def loadBlendshapes(path):
+        if(path.startswith("synthetic:")): return synthetic.load_blendshapes(path)
+        return realLoadBlendshapes(path)
+
+    eos.morphablemodel.load_model = loadModel
+    eos.morphablemodel.load_blendshapes = loadBlendshapes
+
+    return synthetic.morphablemodel
+
+syntheticEos = loadSyntheticEos()
+
+sys.path.insert(0, scriptFolder)
+import Eos_B_Plugin as plugin
+
+def getSpec(vertices, components, modelType): # Synthetic model path understood by the stub eos module
+    return "synthetic:vertices=%d,shape=%d,colour=%d,expression=%d,type=%s" % (vertices, components, components, components, modelType)
+
+def measure(function, repeats): # Time each call, then the peak memory allocated by one more traced call (tracing slows the timed calls down)
+
+    times = []
+
+    for x in range(0, repeats):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    times.sort()
+
+    return {"repeats" : repeats,
+            "min" : times[0],
+            "median" : times[len(times) // 2],
+            "mean" : sum(times) / len(times),
+            "peakMemory" : peak}
+
+def setSliders(obj, indices, rng): # Write random values to sliders the way the panel does, one property at a time
+    for x in indices:
+        obj.sliders.sliderList[int(x)].value = float(rng.normal())
+
+def createHead(spec): # New head object for the synthetic model, its mesh ready for refreshes
+
+    plugin.createBaseShape(spec)
+
+    obj = bpy.context.view_layer.objects.active
+    obj.my_settings.FilePath = spec
+    plugin.flushRefreshes()
+
+    return obj
+
+def removeHead(obj): # Delete the head and its mesh so scenarios don't pile up objects
+    mesh = obj.data
+    bpy.data.objects.remove(obj, do_unlink = True)
+    bpy.data.meshes.remove(mesh)
+
+def runScenarios(vertices, components, modelType, repeats, deletionFolder): # All scenarios for one model size
+
+    spec = getSpec(vertices, components, modelType)
+    rng = np.random.default_rng(0)
+    results = {}
+
+    def createCold(): # Includes loading the model
+        plugin.modelRegistry.models.clear()
+        removeHead(createHead(spec))
+
+    results["createBaseShape (load model)"] = measure(createCold, max(1, repeats // 4))
+    results["createBaseShape (loaded model)"] = measure(lambda: removeHead(createHead(spec)), max(1, repeats // 4))
+
+    obj = createHead(spec)
+    sliderCount = len(obj.sliders.sliderList)
+    shapeSliders = range(0, obj.my_settings.ShapeCount)
+    colourSliders = range(obj.my_settings.ShapeCount, obj.my_settings.ShapeCount + obj.my_settings.ColourCount)
+
+    results["getCoefficients"] = measure(lambda: plugin.getCoefficients(obj), repeats)
+
+    def allSliders(): # Every slider changes, like Random Sliders
+        setSliders(obj, range(0, sliderCount), rng)
+        plugin.flushRefreshes()
+
+    def oneShapeSlider(): # Dragging a single shape slider
+        setSliders(obj, rng.choice(shapeSliders, 1), rng)
+        plugin.flushRefreshes()
+
+    def oneColourSlider(): # Dragging a single colour slider, vertex positions are untouched
+        setSliders(obj, rng.choice(colourSliders, 1), rng)
+        plugin.flushRefreshes()
+
+    if(sliderCount != 0): results["refreshModel (all sliders)"] = measure(allSliders, repeats) # Models without expressions get no sliders
+    if(len(shapeSliders) != 0): results["refreshModel (one shape slider)"] = measure(oneShapeSlider, repeats)
+    if(len(colourSliders) != 0): results["refreshModel (one colour slider)"] = measure(oneColourSlider, repeats)
+
+    loadedModel = plugin.modelRegistry.get(spec, "")
+    topology = plugin.getCompactTopology(loadedModel.evaluator, None)
+    coefficients = plugin.getCoefficients(obj)
+    sample = loadedModel.evaluator.drawSample(coefficients[0], coefficients[2], coefficients[1])
+    hasColour = obj.my_settings.ColourCount != 0
+
+    results["refreshLoopData (colours and uvs)"] = measure(lambda: plugin.refreshLoopData(obj.data, topology, sample, False, hasColour), repeats)
+
+    def toggleDeletion(): # Rebuild the mesh without the first tenth of the vertices, then with all of them
+        obj.my_settings.DeleteVertex = not obj.my_settings.DeleteVertex
+        plugin.flushRefreshes()
+
+    with open(os.path.join(deletionFolder, "benchmark.txt"), "w") as deletionFile:
+        deletionFile.write(",".join(str(x) for x in range(0, vertices // 10)))
+
+    bpy.context.scene.global_setting.GlobalVertexStore = deletionFolder + os.sep
+    obj.my_settings.VertexFileName = "benchmark.txt"
+    results["refreshModel (toggle deleted vertices)"] = measure(toggleDeletion, max(2, repeats // 4))
+    obj.my_settings.DeleteVertex = False
+    plugin.flushRefreshes()
+
+    removeHead(obj)
+
+    return [dict(result, scenario = name, vertices = vertices, components = components, modelType = modelType) for name, result in results.items()]
+
+def getEnvironment(): # Where the results came from, so baselines are compared like for like
+    return {"python" : platform.python_version(),
+            "numpy" : np.__version__,
+            "platform" : platform.platform(),
+            "blender" : ".".join(str(x) for x in bpy.app.version) if inBlender else None,
+            "time" : time.strftime("%Y-%m-%d %H:%M:%S")}
+
+def compareBaseline(results, baselinePath): # Print how each scenario changed against an earlier run
+
+    with open(baselinePath) as baselineFile:
+        baseline = json.load(baselineFile)
+
+    earlier = {(x["scenario"], x["vertices"], x["components"], x["modelType"]) : x for x in baseline["results"]}
+
+    for result in results:
+        old = earlier.get((result["scenario"], result["vertices"], result["components"], result["modelType"]))
+        if(old is None): continue
+
+        print("%-42s %8d verts  median %8.2f ms -> %8.2f ms (%5.2fx)  peak %8.1f MB -> %8.1f MB" % (result["scenario"], result["vertices"],
+                old["median"] * 1000, result["median"] * 1000, old["median"] / max(result["median"], 1e-12),
+                old["peakMemory"] / 1e6, result["peakMemory"] / 1e6))
+
+def getArguments(): # Blender passes the script's own arguments after --
+
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+
+    parser = argparse.ArgumentParser(description = "Benchmark the Eos plugin on synthetic models")
+    parser.add_argument("--sizes", default = "5000,20000,50000", help = "Comma separated vertex counts")
+    parser.add_argument("--components", type = int, default = 60, help = "Shape, colour and expression components of each model")
+    parser.add_argument("--types", default = "pca,blendshapes", help = "Comma separated expression model types (none, pca, blendshapes)")
+    parser.add_argument("--repeats", type = int, default = 20, help = "Calls timed for each scenario")
+    parser.add_argument("--output", default = "benchmark_results.json", help = "JSON file the results are written to")
+    parser.add_argument("--baseline", default = "", help = "Earlier results to compare against")
+    parser.add_argument("--blender", default = "", help = "Run the scenarios under this Blender executable in background mode")
+
+    return parser.parse_args(argv), argv
+
+def runInBlender(blender, argv): # Same scenarios under blender -b --python, without the --blender argument
+
+    index = argv.index("--blender")
+    argv = argv[:index] + argv[index + 2:]
+
+    return subprocess.call([blender, "-b", "--factory-startup", "--python", os.path.abspath(__file__), "--"] + argv)
+
+def main():
+
+    arguments, argv = getArguments()
+
+    if(arguments.blender != ""): return runInBlender(arguments.blender, argv)
+
+    plugin.register()
+
+    if(not inBlender): # The stub bpy has no shader nodes, plain materials are enough
+        bpy.data.materials.new("VertexColourMat")
+        bpy.data.materials.new("ImageColourMat")
+
+    results = []
+
+    with tempfile.TemporaryDirectory() as deletionFolder: # Vertex deletion files for the deletion scenario
+
+        for modelType in arguments.types.split(","):
+            for vertices in arguments.sizes.split(","):
+                print("Benchmarking", vertices, "vertices", modelType)
+                results += runScenarios(int(vertices), arguments.components, modelType, arguments.repeats, deletionFolder)
+
+    for result in results:
+        print("%-42s %8d verts %-12s median %8.2f ms  peak %8.1f MB" % (result["scenario"], result["vertices"], result["modelType"], result["median"] * 1000, result["peakMemory"] / 1e6))
+
+    with open(arguments.output, "w") as outputFile:
+        json.dump({"environment" : getEnvironment(), "results" : results}, outputFile, indent = 2)
+
+    print("Results written to", arguments.output)
+
+    if(arguments.baseline != ""): compareBaseline(results, arguments.baseline)
+
+    return 0
+
+if __name__ == "__main__":
+    code = main()
+    if(not inBlender): sys.exit(code)
@@ -0,0 +1,640 @@
+# Lightweight stand-in for Blender's bpy module, used by the benchmarks on plain CPython
+# Only the parts of the API the plugin touches are provided, properties behave like RNA properties (defaults, update callbacks, id_data)
+
+import sys
+import types as _types
+
+import numpy as np
+
+# --------------------------------------------------------------------------
+# Properties
+# --------------------------------------------------------------------------
+
+
+class _Property: # Descriptor returned by the bpy.props factories
+
+    def __init__(self, kind, **kwargs):
+        self.kind = kind
+        self.kwargs = kwargs
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def _store(self, instance):
+        return instance.__dict__.setdefault("_rna", {})
+
+    def _default(self, instance):
+        if self.kind == "POINTER":
+            group = self.kwargs["type"]
+            if issubclass(group, PropertyGroup):
+                return group(_owner = instance)
+            return None
+        if self.kind == "COLLECTION":
+            return _Collection(self.kwargs["type"], instance)
+        if self.kind == "VECTOR":
+            return list(self.kwargs.get("default", (0.0, 0.0, 0.0)))
+        return self.kwargs.get("default", {"FLOAT": 0.0, "INT": 0, "BOOL": False, "STRING": "", "ENUM": None}[self.kind])
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        store = self._store(instance)
+        if id(self) not in store:
+            store[id(self)] = self._default(instance)
+        return store[id(self)]
+
+    def __set__(self, instance, value):
+        if self.kind == "FLOAT":
+            value = float(value)
+            if "min" in self.kwargs:
+                value = max(self.kwargs["min"], value)
+            if "max" in self.kwargs:
+                value = min(self.kwargs["max"], value)
+        elif self.kind == "INT":
+            value = int(value)
+        elif self.kind == "BOOL":
+            value = bool(value)
+        self._store(instance)[id(self)] = value
+        update = self.kwargs.get("update")
+        if update is not None:
+            update(instance, context)
+
+
+def _factory(kind):
+    def make(*args, **kwargs):
+        return _Property(kind, **kwargs)
+    return make
+
+
+props = _types.ModuleType("bpy.props")
+props.FloatProperty = _factory("FLOAT")
+props.IntProperty = _factory("INT")
+props.BoolProperty = _factory("BOOL")
+props.StringProperty = _factory("STRING")
+props.EnumProperty = _factory("ENUM")
+props.FloatVectorProperty = _factory("VECTOR")
+props.PointerProperty = _factory("POINTER")
+props.CollectionProperty = _factory("COLLECTION")
+
+
+class _Collection(list): # CollectionProperty storage, items are created with add
+
+    def __init__(self, itemType, owner):
+        super().__init__()
+        self.itemType = itemType
+        self.owner = owner
+
+    def add(self):
+        item = self.itemType(_owner = self.owner)
+        self.append(item)
+        return item
+
+    def foreach_get(self, attr, seq):
+        seq[:] = [getattr(item, attr) for item in self]
+
+    def foreach_set(self, attr, seq): # Like RNA, bulk writes do not run update callbacks
+        for item, value in zip(self, seq):
+            prop = getattr(type(item), attr)
+            prop._store(item)[id(prop)] = prop._default(item).__class__(value) if not isinstance(value, np.generic) else value.item()
+
+
+class _StructMeta(type): # Collects annotation-style property declarations as descriptors
+
+    def __new__(mcs, name, bases, namespace):
+        for key, value in list(namespace.get("__annotations__", {}).items()):
+            if isinstance(value, _Property):
+                namespace[key] = value
+        cls = super().__new__(mcs, name, bases, namespace)
+        for key, value in namespace.items():
+            if isinstance(value, _Property):
+                value.name = key
+        return cls
+
+    def __setattr__(cls, key, value): # bpy.types.Object.my_settings = PointerProperty(...)
+        if isinstance(value, _Property):
+            value.name = key
+        super().__setattr__(key, value)
+
+
+class bpy_struct(metaclass = _StructMeta):
+    pass
+
+
+class ID(bpy_struct):
+
+    def __init__(self, name = ""):
+        self.name = name
+
+    @property
+    def id_data(self):
+        return self
+
+    def update_tag(self, refresh = None):
+        pass
+
+    def get(self, key, default = None):
+        return self.__dict__.setdefault("_idprops", {}).get(key, default)
+
+    def __getitem__(self, key):
+        return self.__dict__.setdefault("_idprops", {})[key]
+
+    def __setitem__(self, key, value):
+        self.__dict__.setdefault("_idprops", {})[key] = value
+
+
+class PropertyGroup(bpy_struct):
+
+    def __init__(self, _owner = None):
+        self._owner = _owner
+
+    @property
+    def id_data(self):
+        return self._owner.id_data if self._owner is not None else None
+
+
+# --------------------------------------------------------------------------
+# Mesh data
+# --------------------------------------------------------------------------
+
+
+class _AttributeArray: # Flat numpy backed sequence supporting foreach_get/foreach_set
+
+    def __init__(self, attrs):
+        self.attrs = {name: np.zeros((0,) + shape, dtype = dtype) for name, (shape, dtype) in attrs.items()}
+
+    def __len__(self):
+        return len(next(iter(self.attrs.values())))
+
+    def add(self, count):
+        for name, arr in self.attrs.items():
+            self.attrs[name] = np.concatenate([arr, np.zeros((count,) + arr.shape[1:], dtype = arr.dtype)])
+
+    def clear(self):
+        for name, arr in self.attrs.items():
+            self.attrs[name] = arr[:0]
+
+    def foreach_set(self, attr, seq):
+        arr = self.attrs[attr]
+        arr.reshape(-1)[:] = np.asarray(seq).reshape(-1)
+
+    def foreach_get(self, attr, seq):
+        seq[:] = self.attrs[attr].reshape(-1)
+
+    def __getitem__(self, index):
+        return _Element(self, index)
+
+    def __iter__(self):
+        return (_Element(self, i) for i in range(len(self)))
+
+
+class _Element:
+
+    def __init__(self, array, index):
+        object.__setattr__(self, "_array", array)
+        object.__setattr__(self, "index", index)
+
+    def __getattr__(self, name):
+        return self._array.attrs[name][self.index]
+
+    def __setattr__(self, name, value):
+        self._array.attrs[name][self.index] = value
+
+
+class _LoopLayer:
+
+    def __init__(self, name, attr, width):
+        self.name = name
+        self.data = _AttributeArray({attr: ((width,), np.float32)})
+
+
+class _LoopLayers(list):
+
+    def __init__(self, mesh, attr, width):
+        super().__init__()
+        self.mesh = mesh
+        self.attr = attr
+        self.width = width
+        self.active = None
+
+    def new(self, name = "UVMap"):
+        layer = _LoopLayer(name, self.attr, self.width)
+        layer.data.add(len(self.mesh.loops))
+        self.append(layer)
+        if self.active is None:
+            self.active = layer
+        return layer
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            for layer in self:
+                if layer.name == key:
+                    return layer
+            raise KeyError(key)
+        return list.__getitem__(self, key)
+
+    def get(self, key, default = None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+
+class _KeyBlock:
+
+    def __init__(self, name, count):
+        self.name = name
+        self.value = 0.0
+        self.slider_min = 0.0
+        self.slider_max = 1.0
+        self.data = _AttributeArray({"co": ((3,), np.float32)})
+        self.data.add(count)
+        self.drivers = []
+
+    def driver_add(self, path):
+        fcurve = _FCurve(path)
+        self.drivers.append(fcurve)
+        return fcurve
+
+
+class _FCurve:
+
+    def __init__(self, path):
+        self.data_path = path
+        self.driver = _Driver()
+
+
+class _Driver:
+
+    def __init__(self):
+        self.type = "SCRIPTED"
+        self.expression = ""
+        self.variables = _Variables()
+
+
+class _Variables(list):
+
+    def new(self):
+        var = _types.SimpleNamespace(name = "var", type = "SINGLE_PROP", targets = [_types.SimpleNamespace(id_type = "OBJECT", id = None, data_path = "")])
+        self.append(var)
+        return var
+
+
+class _Keyframes(list): # Keyframe points of an animation curve, kept sorted by frame
+
+    def insert(self, frame, value, options = None):
+        point = _types.SimpleNamespace(co = (float(frame), float(value)), handle_left = (float(frame), float(value)), handle_right = (float(frame), float(value)), interpolation = "LINEAR")
+        self[:] = sorted([p for p in self if p.co[0] != frame] + [point], key = lambda p: p.co[0])
+        return point
+
+    def foreach_get(self, attr, seq):
+        seq[:] = np.array([getattr(p, attr) for p in self], dtype = np.float64).reshape(-1)
+
+
+class _AnimCurve: # Action fcurve, evaluated with linear interpolation and constant extrapolation
+
+    def __init__(self, data_path, index = 0):
+        self.data_path = data_path
+        self.array_index = index
+        self.keyframe_points = _Keyframes()
+        self.extrapolation = "CONSTANT"
+
+    def evaluate(self, frame):
+        if len(self.keyframe_points) == 0:
+            return 0.0
+        frames = [p.co[0] for p in self.keyframe_points]
+        values = [p.co[1] for p in self.keyframe_points]
+        return float(np.interp(frame, frames, values))
+
+
+class _ActionCurves(list):
+
+    def new(self, data_path, index = 0, action_group = ""):
+        fcurve = _AnimCurve(data_path, index)
+        self.append(fcurve)
+        return fcurve
+
+
+class Action(ID):
+
+    def __init__(self, name = "Action"):
+        super().__init__(name)
+        self.fcurves = _ActionCurves()
+
+
+class _AnimData:
+
+    def __init__(self):
+        self.action = None
+
+
+def _resolvePath(owner, path): # Owner and attribute name of an RNA path like sliders.sliderList[3].value
+    parts = path.split(".")
+    for part in parts[:-1]:
+        if "[" in part:
+            name, index = part[:-1].split("[")
+            owner = getattr(owner, name)[int(index)]
+        else:
+            owner = getattr(owner, part)
+    return owner, parts[-1]
+
+
+class _KeyBlocks(list):
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            for block in self:
+                if block.name == key:
+                    return block
+            raise KeyError(key)
+        return list.__getitem__(self, key)
+
+    def get(self, key, default = None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+
+class Key(ID):
+
+    def __init__(self):
+        super().__init__("Key")
+        self.key_blocks = _KeyBlocks()
+        self.use_relative = True
+
+
+class Mesh(ID):
+
+    def __init__(self, name = "Mesh"):
+        super().__init__(name)
+        self.vertices = _AttributeArray({"co": ((3,), np.float32), "select": ((), bool)})
+        self.loops = _AttributeArray({"vertex_index": ((), np.int32)})
+        self.polygons = _AttributeArray({"loop_start": ((), np.int32), "loop_total": ((), np.int32), "vertices_flat": ((), np.int32), "use_smooth": ((), bool)})
+        self.vertex_colors = _LoopLayers(self, "color", 4)
+        self.uv_layers = _LoopLayers(self, "uv", 2)
+        self.materials = []
+        self.shape_keys = None
+
+    def clear_geometry(self):
+        self.vertices.clear()
+        self.loops.clear()
+        self.polygons.clear()
+        self.vertex_colors = _LoopLayers(self, "color", 4)
+        self.uv_layers = _LoopLayers(self, "uv", 2)
+        self.shape_keys = None
+
+    def from_pydata(self, vertices, edges, faces):
+        self.vertices.add(len(vertices))
+        self.vertices.foreach_set("co", np.asarray(vertices, dtype = np.float32).reshape(-1))
+        if not (edges or faces): return # Same test as Blender before 3.0, raises on numpy arrays
+        faces = [list(f) for f in faces]
+        self.polygons.add(len(faces))
+        totals = np.array([len(f) for f in faces], dtype = np.int32)
+        self.polygons.foreach_set("loop_total", totals)
+        self.polygons.foreach_set("loop_start", np.concatenate([[0], np.cumsum(totals)[:-1]]).astype(np.int32) if len(faces) else totals)
+        self.loops.add(int(totals.sum()))
+        self.loops.foreach_set("vertex_index", np.concatenate(faces).astype(np.int32) if len(faces) else totals)
+
+    def update(self, calc_edges = False):
+        pass
+
+    def validate(self, verbose = False):
+        return False
+
+
+class Object(ID):
+
+    def __init__(self, name = "Object", data = None):
+        super().__init__(name)
+        self.data = data
+        self.parent = None
+        self.scale = (1.0, 1.0, 1.0)
+        self.location = (0.0, 0.0, 0.0)
+        self.rotation_euler = (0.0, 0.0, 0.0)
+        self.mode = "OBJECT"
+        self.type = "MESH" if isinstance(data, Mesh) else "EMPTY"
+        self.hidden = False
+        self.animation_data = None
+
+    def hide_set(self, state):
+        self.hidden = state
+
+    def animation_data_create(self):
+        if self.animation_data is None:
+            self.animation_data = _AnimData()
+        return self.animation_data
+
+    def shape_key_add(self, name = "Key", from_mix = False):
+        if self.data.shape_keys is None:
+            self.data.shape_keys = Key()
+        block = _KeyBlock(name, len(self.data.vertices))
+        self.data.shape_keys.key_blocks.append(block)
+        return block
+
+    def shape_key_clear(self):
+        self.data.shape_keys = None
+
+
+class Scene(ID):
+
+    def __init__(self, name = "Scene"):
+        super().__init__(name)
+        self.frame_current = 1
+        self.frame_start = 1
+        self.frame_end = 250
+        self.render = _types.SimpleNamespace(fps = 24, fps_base = 1.0)
+
+    @property
+    def objects(self): # Every object is linked to the one scene
+        return data.objects
+
+    def frame_set(self, frame): # Animated properties are written through their setters, so their update callbacks run
+        self.frame_current = frame
+        for handler in list(app.handlers.frame_change_pre):
+            handler(self, None)
+        for obj in data.objects:
+            if obj.animation_data is not None and obj.animation_data.action is not None:
+                for fcurve in obj.animation_data.action.fcurves:
+                    owner, name = _resolvePath(obj, fcurve.data_path)
+                    setattr(owner, name, fcurve.evaluate(frame))
+        for handler in list(app.handlers.frame_change_post):
+            handler(self, None)
+
+
+class Material(ID):
+    pass
+
+
+class Operator(bpy_struct):
+
+    def report(self, level, message):
+        print(level, message)
+
+
+class Panel(bpy_struct):
+    pass
+
+
+class Collection(ID):
+
+    def __init__(self, name = "Collection"):
+        super().__init__(name)
+        self.objects = _DataCollection(None)
+
+
+types = _types.ModuleType("bpy.types")
+for _cls in (bpy_struct, ID, PropertyGroup, Mesh, Object, Scene, Material, Operator, Panel, Key, Collection, Action):
+    setattr(types, _cls.__name__, _cls)
+
+
+# --------------------------------------------------------------------------
+# bpy.data / bpy.context
+# --------------------------------------------------------------------------
+
+
+class _DataCollection(list):
+
+    def __init__(self, factory):
+        super().__init__()
+        self.factory = factory
+
+    def new(self, name, *args): # Names are unique like Blender's, later ones get .001, .002, ...
+        names = set(item.name for item in self)
+        base, number = name, 0
+        while name in names:
+            number += 1
+            name = base + "." + str(number).zfill(3)
+        item = self.factory(name, *args)
+        self.append(item)
+        return item
+
+    def link(self, item):
+        if item not in self:
+            self.append(item)
+
+    def get(self, name, default = None):
+        for item in self:
+            if item.name == name:
+                return item
+        return default
+
+    def remove(self, item, do_unlink = True):
+        if item in self:
+            list.remove(self, item)
+
+
+data = _types.SimpleNamespace()
+
+
+def _reset():
+    data.meshes = _DataCollection(Mesh)
+    data.objects = _DataCollection(Object)
+    data.materials = _DataCollection(Material)
+    data.collections = _DataCollection(Collection)
+    data.scenes = _DataCollection(Scene)
+    data.actions = _DataCollection(Action)
+    data.collections.new("Collection")
+    scene = data.scenes.new("Scene")
+    context.scene = scene
+    context.object = None
+    context.collection = data.collections[0]
+    context.view_layer = _types.SimpleNamespace(objects = _ActiveObjects())
+    context.window = None
+    context.area = None # Like a script run from the command line, set an area and region to act as the sidebar
+    context.region = None
+    context.window_manager = _WindowManager()
+    context.workspace = _types.SimpleNamespace(status_text = None)
+    context.workspace.status_text_set = lambda text: setattr(context.workspace, "status_text", text)
+
+
+class _WindowManager: # Modal operators are kept so scripts can send them events
+
+    def __init__(self):
+        self.handlers = []
+        self.progress = None
+
+    def event_timer_add(self, time_step, window = None):
+        return _types.SimpleNamespace(time_step = time_step)
+
+    def event_timer_remove(self, timer):
+        pass
+
+    def modal_handler_add(self, operator):
+        self.handlers.append(operator)
+        return True
+
+    def progress_begin(self, start, end):
+        self.progress = start
+
+    def progress_update(self, value):
+        self.progress = value
+
+    def progress_end(self):
+        self.progress = None
+
+
+class _ActiveObjects:
+
+    @property
+    def active(self):
+        return context.object
+
+    @active.setter
+    def active(self, obj):
+        context.object = obj
+
+
+context = _types.SimpleNamespace()
+
+# --------------------------------------------------------------------------
+# bpy.app / bpy.utils
+# --------------------------------------------------------------------------
+
+app = _types.ModuleType("bpy.app")
+app.background = True
+app.version = (2, 93, 0)
+
+
+class _Timers: # Timers never fire on their own here, run_pending drains them
+
+    def __init__(self):
+        self.pending = []
+
+    def register(self, function, first_interval = 0, persistent = False):
+        if function not in self.pending:
+            self.pending.append(function)
+
+    def unregister(self, function):
+        if function in self.pending:
+            self.pending.remove(function)
+
+    def is_registered(self, function):
+        return function in self.pending
+
+    def run_pending(self):
+        while self.pending:
+            function = self.pending.pop(0)
+            if function() is not None:
+                self.pending.append(function)
+
+
+app.timers = _Timers()
+handlers = _types.ModuleType("bpy.app.handlers")
+for _name in ("load_post", "frame_change_pre", "frame_change_post", "depsgraph_update_post", "render_init", "render_pre", "render_post", "render_complete", "render_cancel", "save_pre"):
+    setattr(handlers, _name, [])
+handlers.persistent = lambda function: function
+app.handlers = handlers
+
+utils = _types.ModuleType("bpy.utils")
+utils.register_class = lambda cls: None
+utils.unregister_class = lambda cls: None
+
+path = _types.ModuleType("bpy.path")
+path.abspath = lambda p: p
+path.clean_name = lambda name: "".join(c if c.isalnum() or c in "_-." else "_" for c in name)
+
+for _name, _module in (("bpy.props", props), ("bpy.types", types), ("bpy.app", app), ("bpy.app.handlers", handlers), ("bpy.utils", utils), ("bpy.path", path)):
+    sys.modules[_name] = _module
+
+_reset()
@@ -0,0 +1,217 @@
+# Synthetic stand-in for the eos python bindings, used by the benchmarks
+# load_model only accepts synthetic specs such as "synthetic:vertices=5000,shape=50,colour=50,expression=20,type=blendshapes"
+# Models follow eos semantics: a sample is mean + rescaled basis * coefficients per sub model, blendshapes add deformation * coefficient
+
+import enum
+import sys
+import types as _types
+
+import numpy as np
+
+
+class ExpressionModelType(enum.IntEnum):
+    NoExpressions = 0
+    PcaModel = 1
+    Blendshapes = 2
+
+
+class Mesh:
+
+    def __init__(self, vertices, colors, texcoords, tvi, tci, tti):
+        self.vertices = vertices
+        self.colors = colors
+        self.texcoords = texcoords
+        self.tvi = tvi
+        self.tci = tci
+        self.tti = tti
+
+
+class PcaModel:
+
+    def __init__(self, mean = None, orthonormal = None, eigenvalues = None, triangles = None):
+        self.mean = np.zeros(0, dtype = np.float32) if mean is None else mean
+        self.orthonormal = np.zeros((len(self.mean), 0), dtype = np.float32) if orthonormal is None else orthonormal
+        self.eigenvalues = np.zeros(0, dtype = np.float32) if eigenvalues is None else eigenvalues
+        self.triangles = [] if triangles is None else triangles
+        self.rescaled = self.orthonormal * np.sqrt(self.eigenvalues)[None, :]
+
+    def get_num_principal_components(self):
+        return self.orthonormal.shape[1]
+
+    def get_data_dimension(self):
+        return len(self.mean)
+
+    def get_mean(self):
+        return self.mean
+
+    def get_eigenvalues(self):
+        return self.eigenvalues
+
+    def get_orthonormal_pca_basis(self):
+        return self.orthonormal
+
+    def get_rescaled_pca_basis(self):
+        return self.rescaled
+
+    def get_triangle_list(self):
+        return self.triangles
+
+    def draw_sample(self, coefficients):
+        alphas = np.zeros(self.get_num_principal_components(), dtype = np.float32)
+        alphas[:len(coefficients)] = coefficients
+        return self.mean + self.rescaled @ alphas
+
+
+class Blendshape:
+
+    def __init__(self, name = "", deformation = None):
+        self.name = name
+        self.deformation = deformation
+
+
+class MorphableModel:
+
+    ExpressionModelType = ExpressionModelType
+
+    def __init__(self, shape_model, expression_model = None, color_model = None, vertex_definitions = None, texture_coordinates = None, texture_triangle_indices = None):
+        self.shape_model = shape_model
+        self.expression_model = expression_model
+        self.color_model = PcaModel() if color_model is None else color_model
+        self.texture_coordinates = [] if texture_coordinates is None else texture_coordinates
+        self.texture_triangle_indices = texture_triangle_indices
+
+    def get_shape_model(self):
+        return self.shape_model
+
+    def get_color_model(self):
+        return self.color_model
+
+    def get_expression_model(self):
+        return self.expression_model
+
+    def get_texture_coordinates(self):
+        return self.texture_coordinates
+
+    def get_expression_model_type(self):
+        if self.expression_model is None:
+            return ExpressionModelType.NoExpressions
+        if isinstance(self.expression_model, PcaModel):
+            return ExpressionModelType.PcaModel
+        return ExpressionModelType.Blendshapes
+
+    def has_color_model(self):
+        return self.color_model.get_data_dimension() != 0
+
+    def draw_sample(self, shape_coefficients, second, third = None):
+        if third is None: # draw_sample(shape, colour)
+            expression_coefficients, color_coefficients = [], second
+        else:
+            expression_coefficients, color_coefficients = second, third
+
+        shape = self.shape_model.draw_sample(shape_coefficients)
+
+        modelType = self.get_expression_model_type()
+        if modelType == ExpressionModelType.PcaModel:
+            shape = shape + self.expression_model.draw_sample(expression_coefficients)
+        elif modelType == ExpressionModelType.Blendshapes and len(expression_coefficients) != 0:
+            for blendshape, weight in zip(self.expression_model, expression_coefficients):
+                shape = shape + blendshape.deformation * weight
+
+        colours = []
+        if self.has_color_model():
+            colours = list(self.color_model.draw_sample(color_coefficients).reshape(-1, 3))
+
+        triangles = self.shape_model.get_triangle_list()
+        tti = triangles if self.texture_triangle_indices is None else self.texture_triangle_indices
+        return Mesh(list(shape.reshape(-1, 3)), colours, list(self.texture_coordinates), triangles, triangles if colours else [], tti)
+
+
+def _gridTopology(vertexCount):
+    width = max(2, int(np.sqrt(vertexCount)))
+    height = max(2, vertexCount // width)
+    index = np.arange(width * height).reshape(height, width)
+    a = index[:-1, :-1].reshape(-1)
+    b = index[:-1, 1:].reshape(-1)
+    c = index[1:, :-1].reshape(-1)
+    d = index[1:, 1:].reshape(-1)
+    faces = np.concatenate([np.stack([a, b, d], axis = 1), np.stack([a, d, c], axis = 1)])
+    u, v = np.meshgrid(np.linspace(0, 1, width), np.linspace(0, 1, height))
+    grid = np.stack([u.reshape(-1), v.reshape(-1)], axis = 1).astype(np.float32)
+    return width * height, [list(map(int, f)) for f in faces], grid
+
+
+def _basis(rng, dimension, components):
+    if components == 0:
+        return np.zeros((dimension, 0), dtype = np.float32), np.zeros(0, dtype = np.float32)
+    basis = rng.standard_normal((dimension, components)).astype(np.float32)
+    basis /= np.linalg.norm(basis, axis = 0, keepdims = True)
+    eigenvalues = np.linspace(4.0, 0.01, components).astype(np.float32) ** 2
+    return basis, eigenvalues
+
+
+def synthetic_model(vertices = 5000, shape = 50, colour = 50, expression = 20, type = "pca", seed = 0, region = 0.1): # type is none, pca or blendshapes
+    rng = np.random.default_rng(seed)
+    count, faces, texcoords = _gridTopology(vertices)
+    positions = np.concatenate([texcoords * 100.0, np.zeros((count, 1), dtype = np.float32)], axis = 1)
+
+    shapeBasis, shapeValues = _basis(rng, count * 3, shape)
+    shapeModel = PcaModel(positions.reshape(-1).astype(np.float32), shapeBasis, shapeValues, faces)
+
+    colourModel = PcaModel()
+    if colour:
+        colourBasis, colourValues = _basis(rng, count * 3, colour)
+        colourModel = PcaModel(np.full(count * 3, 0.5, dtype = np.float32), colourBasis * 0.01, colourValues, faces)
+
+    expressionModel = None
+    if type == "pca":
+        expressionBasis, expressionValues = _basis(rng, count * 3, expression)
+        expressionModel = PcaModel(np.zeros(count * 3, dtype = np.float32), expressionBasis, expressionValues, faces)
+    elif type == "blendshapes":
+        expressionModel = []
+        size = max(1, int(count * region))
+        for x in range(expression): # Each blendshape only moves a small region, like real expression sets
+            deformation = np.zeros(count * 3, dtype = np.float32)
+            start = int(rng.integers(0, max(1, count - size)))
+            deformation[start * 3:(start + size) * 3] = rng.standard_normal(size * 3).astype(np.float32)
+            expressionModel.append(Blendshape("blendshape_%d" % x, deformation))
+
+    uvFaces = None if colour else [] # Colourless models have one uv per vertex and no uv faces, like sfm_shape_3448.bin
+
+    return MorphableModel(shapeModel, expressionModel, colourModel, texture_coordinates = list(texcoords), texture_triangle_indices = uvFaces)
+
+
+def _parseSpec(path):
+    spec = {}
+    for part in path.split(":", 1)[1].split(","):
+        if part:
+            key, value = part.split("=")
+            spec[key] = value if key == "type" else (float(value) if "." in value else int(value))
+    return spec
+
+
+def load_model(path):
+    if path.startswith("synthetic:"):
+        return synthetic_model(**_parseSpec(path))
+    raise RuntimeError("The stub eos module can only load synthetic models: " + path)
+
+
+def load_blendshapes(path):
+    if path.startswith("synthetic:"):
+        return synthetic_model(**dict(_parseSpec(path), type = "blendshapes")).get_expression_model()
+    raise RuntimeError("The stub eos module can only load synthetic blendshapes: " + path)
+
+
+morphablemodel = _types.ModuleType("eos.morphablemodel")
+morphablemodel.MorphableModel = MorphableModel
+morphablemodel.PcaModel = PcaModel
+morphablemodel.Blendshape = Blendshape
+morphablemodel.load_model = load_model
+morphablemodel.load_blendshapes = load_blendshapes
+morphablemodel.synthetic_model = synthetic_model
+
+core = _types.ModuleType("eos.core")
+core.Mesh = Mesh
+
+if(__name__ == "eos"): # Only stand in for eos when imported as eos, Blender runs load it under another name next to the real bindings
+    sys.modules["eos.morphablemodel"] = morphablemodel
+    sys.modules["eos.core"] = core
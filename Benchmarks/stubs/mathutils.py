@@ -0,0 +1,25 @@
+# Minimal stand-in for Blender's mathutils module
+
+import math
+
+
+class Vector(tuple):
+
+    def __new__(cls, values):
+        return super().__new__(cls, (float(v) for v in values))
+
+    def __add__(self, other):
+        return Vector(a + b for a, b in zip(self, other))
+
+    def __sub__(self, other):
+        return Vector(a - b for a, b in zip(self, other))
+
+    def __truediv__(self, value):
+        return Vector(a / value for a in self)
+
+    def __mul__(self, value):
+        return Vector(a * value for a in self)
+
+    @property
+    def length(self):
+        return math.sqrt(sum(a * a for a in self))
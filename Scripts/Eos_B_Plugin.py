@@ -1,16 +1,36 @@
 import bpy
 import eos
 import numpy as np
-import bmesh
 from enum import Enum
 import os.path
 import mathutils
+import time
+import json
+import itertools
+import struct
+import threading
 
 from math import radians
+from bpy.app.handlers import persistent
+from collections import OrderedDict
 
 from numpy import random
 
 maxSlider = 20
+basisPrecisions = [("FLOAT32", "Float32", "Full precision"), ("FLOAT16", "Float16", "Half the memory"), ("INT8", "Int8", "A quarter of the memory, one scale per component")]
+sliderLimit = 3 # Sliders go from -sliderLimit to sliderLimit
+
+evaluatorTolerance = 1e-4 # Largest difference allowed between the fast evaluator and eos draw_sample (relative to the model size)
+sparseColumnLoop = 16 # Sparse blendshape products with up to this many non zero sliders add one column at a time
+timingWindow = 100 # Number of recent timings kept for each stage in the panel summary
+modelCacheVersion = 2 # Bump when the model cache layout changes, older caches are then ignored
+quantisedBlockRows = 16384 # Rows of a quantised basis dequantised at once, bounds the temporary float32 copy
+fullRecomputeInterval = 256 # Number of single slider (delta) updates before the sample is recomputed from scratch to stop float error building up
+resultStep = 1e-5 # Coefficients closer than this share a cached result
+minimumComponents = 8 # Fewest shape and colour components a progressive refresh evaluates
+pointCacheFormats = [("PC2", "PC2", "Little endian point cache with a start frame and sample rate"), ("MDD", "MDD", "Big endian point cache with a time for every frame")]
+pointCacheChunk = 256 # Frames whose coefficients are worked out at once while exporting
+modelLoadPoll = 0.1 # Seconds between checks on a background load that dirty heads are waiting for
 
 bl_info  = {
     "name" : "Eos Interface",
@@ -18,20 +38,11 @@ bl_info  = {
     "catagory" : "Eos"
 }
 
-class ShapeKeeper(): # Stores model data for currently selected model
-    base = ""
-    modelPath = ""
-    blendShapePath = ""
-    leftEye = ""
-    rightEye = ""
-
 class SliderType(Enum):
     Shape = 0
     Colour = 1
     Expression = 2
 
-aShapeKeeper = ShapeKeeper() # Only one script is loaded so a object was needed
-
 def getChildren(obj): # Get the children of the object
     children = []
     for ob in bpy.data.objects:
@@ -40,125 +51,317 @@ def getChildren(obj): # Get the children of the object
 
     return children
 
-def getCoefficients(o): # return a 2D list containing all of the coefficients Shape, Colour, Expression
+def getEyes(head): # The eyes linked to this head, heads saved before eyes were stored on them use their two children
+
+    if(not head.my_settings.HasEye): return None, None
+
+    leftEye = head.my_settings.LeftEye
+    rightEye = head.my_settings.RightEye
+
+    if(leftEye == None or rightEye == None):
+
+        children = getChildren(head)
+
+        if(len(children) == 2):
+            leftEye = children[0]
+            rightEye = children[1]
+
+    return leftEye, rightEye
+
+def getCoefficients(o): # return a list of the Shape, Colour and Expression coefficient arrays
+
+    coefficients = o.sliders.getVector()
+
+    if(coefficients is None): return # If the sliders haven't been created yet return None
+
+    return splitCoefficients(o, coefficients)
+
+def splitCoefficients(o, coefficients): # Split a whole coefficient vector into its shape, colour and expression parts, sliders are stored in a 1D list
 
     shapeCount = o.my_settings.ShapeCount
     colourCount = o.my_settings.ColourCount
-    expressionCount = o.my_settings.ExpressionCount
 
-    if len(o.sliders.sliderList) < shapeCount + colourCount + expressionCount : return # If the sliders haven't been created yet return None
+    return [coefficients[:shapeCount], coefficients[shapeCount:shapeCount + colourCount], coefficients[shapeCount + colourCount:]]
 
-    me = [[0.0]* shapeCount, [0.0]* colourCount, [0.0]* expressionCount]
+def getRandomCoefficients(counts, deviations, generator = random): # Gaussian random shape, colour and expression coefficients in slider order, clipped to the slider range
 
-    for x in range(0,shapeCount):           
-        me[0][x] =  o.sliders.sliderList[x].value
-    
-    for x in range(shapeCount,shapeCount + colourCount):
-        me[1][x - shapeCount] =  o.sliders.sliderList[x].value
+    parts = [generator.normal(loc = 0, scale = deviation, size = count) for count, deviation in zip(counts, deviations)]
 
-    for x in range(shapeCount + colourCount,shapeCount + colourCount + expressionCount): # Sliders are stored in a 1D list
-        me[2][x - shapeCount - colourCount] =  o.sliders.sliderList[x].value
+    return np.clip(np.concatenate(parts), -sliderLimit, sliderLimit).astype(np.float32)
 
+def flattenFaces(faces): # Flatten faces into one index array in face-loop order (the order blender creates loops in)
 
-    return me
+    if(len(faces) == 0): return np.zeros(0, dtype = np.int32)
 
-def refreshColoursBM(mesh, coloursLocation, colours, textureCoordinates, textureLocations, shouldSmooth, shouldDelete): # Refresh colours using the BM mesh instead of normal mesh (much faster)
+    try:
+        return np.asarray(faces, dtype = np.int32).reshape(-1) # Every face has the same number of vertices
+    except ValueError:
+        return np.concatenate([np.asarray(face, dtype = np.int32) for face in faces]) # Not always triangulated
 
-    bm = bmesh.new()
-    bm.from_mesh(mesh)
+class CompactTopology(): # Model topology with the deleted vertices removed, built once per model and deletion file
 
-    if not bm.loops.layers.color:
-        bm.loops.layers.color.new("color")
+    def __init__(self, evaluator, deletionVerts):
 
-    colour_layer =  bm.loops.layers.color['color']
+        loopVertices = flattenFaces(evaluator.tvi)
+        loopColours = flattenFaces(evaluator.tci)
+        loopUVs = flattenFaces(evaluator.tti)
+        faceSizes = evaluator.faceSizes
 
-    i = 0
-    x = 0
+        vertexCount = evaluator.vertexCount
 
-    if( bm.loops.layers.uv.active == None):
-        new_uv = bm.loops.layers.uv.new()
+        self.keptVerts = None # Mask of the vertices that aren't deleted, None if nothing is deleted
 
-    uv_lay = bm.loops.layers.uv.active
+        if(deletionVerts is not None and len(deletionVerts) != 0):
 
+            keptVerts = np.ones(vertexCount, dtype = bool)
+            keptVerts[deletionVerts[deletionVerts < vertexCount]] = False
 
-    for face in bm.faces:
+            faceStarts = np.concatenate(([0], np.cumsum(faceSizes)[:-1]))
+            keptFaces = np.logical_and.reduceat(keptVerts[loopVertices], faceStarts) # A face is removed with any of its vertices
+            loopMask = np.repeat(keptFaces, faceSizes)
 
-        face.smooth = shouldSmooth # Smooth each face if needed
+            if(len(loopColours) == len(loopMask)): loopColours = loopColours[loopMask]
+            if(len(loopUVs) == len(loopMask)): loopUVs = loopUVs[loopMask]
 
-        i = 0
-        for loop in face.loops: # Loop each vertex (not always triangulated)
-            color = [colours[coloursLocation[x][i]][0],colours[coloursLocation[x][i]][1],colours[coloursLocation[x][i]][2],1.0] # Must include alpha
-            loop[colour_layer] = color
-          
+            loopVertices = loopVertices[loopMask]
+            faceSizes = faceSizes[keptFaces]
 
-            loop[uv_lay].uv = [textureCoordinates[textureLocations[x][i]][0],textureCoordinates[textureLocations[x][i]][1]]
+            self.keptVerts = keptVerts
+            vertexCount = np.count_nonzero(keptVerts)
 
-            i += 1
-       
-           
-        x += 1
+        remap = np.arange(evaluator.vertexCount, dtype = np.int32) if self.keptVerts is None else (np.cumsum(self.keptVerts) - 1).astype(np.int32) # Remaining vertices keep their order
 
-    if(shouldDelete):
+        self.vertexCount = vertexCount
+        self.faceSizes = faceSizes
+        self.loopStarts = np.concatenate(([0], np.cumsum(faceSizes)[:-1])).astype(np.int32)
+        self.loopVertices = remap[loopVertices] # Indices into the compacted vertices, used to build the mesh
+        self.loopVertexUVs = loopVertices # Indices into the full model, models without colour use the vertex index for uv
+        self.loopColours = loopColours
+        self.loopUVs = loopUVs
 
-        deletionVerts = getdeletionVerts()    
+    def compact(self, values): # Per vertex values of the full model reduced to the kept vertices
+        if(self.keptVerts is None): return values
+        return values[self.keptVerts]
 
-        if(not deletionVerts == None):
+def getCompactTopology(evaluator, deletionPath): # Topology for the model without the vertices in the deletion file (None for no deletion)
 
-            deleteVerts(bm, deletionVerts)
+    key = None
 
-    bm.to_mesh(mesh) # Convert bmesh back to blender mesh
+    if(deletionPath != None): key = (deletionPath, getFileTime(deletionPath)) # Saving the file again changes the vertices
 
-    return None
+    topology = evaluator.topologies.get(key)
 
-def assignUV(mesh, textureCoordinates, shouldSmooth): # Assigns morphable models uv coordinates to the blender object
+    if(topology == None):
 
-    if( mesh.loops.layers.uv.active == None ):
-        new_uv = mesh.loops.layers.uv.new()
+        deletionVerts = None
 
-    uv_lay = mesh.loops.layers.uv.active
+        if(key != None): deletionVerts = loadDeletionVerts(deletionPath)
 
-    for face in mesh.faces:
+        topology = CompactTopology(evaluator, deletionVerts)
 
-        face.smooth = shouldSmooth # Smooth each face if needed
+        evaluator.topologies[key] = topology
 
-        for loop in face.loops: # Loop each vertex (not always triangulated) 
+    return topology
 
-            loop[uv_lay].uv = [textureCoordinates[loop.vert.index][0],textureCoordinates[loop.vert.index][1]]
+def getVertexClusters(positions, target): # Group the vertices by grid cell, the cell size is searched so about target cells are used, returns the cluster of each vertex
 
-def getdeletionVerts(): # Load the file and collect vertices into a usable list
+    low = positions.min(axis = 0)
+    extent = max(float((positions.max(axis = 0) - low).max()), 1e-12)
 
-    scene = bpy.context.scene
-    obj = bpy.context.object
+    small, large = 0.0, extent # One cell the size of the model is always under the target
+    clusters = np.zeros(len(positions), dtype = np.int64)
+
+    for x in range(0, 20):
+
+        size = (small + large) / 2
+        cellCount = int(extent / size) + 1
+
+        cells = np.floor((positions - low) / size).astype(np.int64)
+        cellKeys = (cells[:, 0] * cellCount + cells[:, 1]) * cellCount + cells[:, 2]
+
+        unique, inverse = np.unique(cellKeys, return_inverse = True)
+
+        if(len(unique) > target):
+            small = size
+        else:
+            large = size
+            clusters = inverse.reshape(-1)
+
+    return clusters
+
+class PreviewModel(): # Coarse copy of the model shown while sliders are dragged, each grid cluster of vertices is drawn by the vertex nearest its centre
+
+    def __init__(self, evaluator, topology, ratio):
+
+        positions = topology.compact(evaluator.shapeMean.reshape(-1, 3))
+        clusters = getVertexClusters(positions, max(4, int(topology.vertexCount * ratio)))
+        clusterCount = int(clusters.max()) + 1
+
+        centres = np.stack([np.bincount(clusters, weights = positions[:, x], minlength = clusterCount) for x in range(0, 3)], axis = 1) / np.bincount(clusters, minlength = clusterCount)[:, None]
+        distances = np.linalg.norm(positions - centres[clusters], axis = 1)
+
+        order = np.lexsort((distances, clusters))
+        representatives = order[np.concatenate(([True], clusters[order][1:] != clusters[order][:-1]))] # Closest vertex of each cluster, in cluster order
+
+        corners = clusters[topology.loopVertices.reshape(-1, 3)]
+        keptFaces = np.flatnonzero((corners[:, 0] != corners[:, 1]) & (corners[:, 1] != corners[:, 2]) & (corners[:, 0] != corners[:, 2])) # Faces inside one cluster collapse
+
+        unique, first = np.unique(np.sort(corners[keptFaces], axis = 1), axis = 0, return_index = True) # Faces joining the same three clusters are drawn once
+        keptFaces = keptFaces[np.sort(first)]
+
+        modelVerts = representatives if topology.keptVerts is None else np.flatnonzero(topology.keptVerts)[representatives]
+
+        self.vertexCount = clusterCount
+        self.faceSizes = np.full(len(keptFaces), 3, dtype = np.int32)
+        self.loopStarts = np.arange(0, len(keptFaces) * 3, 3, dtype = np.int32)
+        self.loopVertices = corners[keptFaces].reshape(-1).astype(np.int32)
+        self.loopVertexUVs = modelVerts[self.loopVertices]
+        self.loopColours = self.loopVertices # Colours are evaluated for the preview vertices only
+        self.loopUVs = topology.loopUVs.reshape(-1, 3)[keptFaces].reshape(-1) if len(topology.loopUVs) == len(topology.loopVertices) else topology.loopUVs
+
+        self.meanPositions = positions # Full resolution mean shape, to find the preview vertex nearest an eye vertex
+        self.previewPositions = positions[representatives]
+
+        rows = (modelVerts[:, None] * 3 + np.arange(3)).reshape(-1) # x, y and z rows of each kept vertex
+
+        self.shapeMean = evaluator.shapeMean[rows]
+        self.shapeBasis = evaluator.shapeBasis.getRows(rows)
+        self.expressionMean = evaluator.expressionMean[rows]
+        self.expressions = evaluator.expressions.getRows(rows)
+        self.hasColour = len(evaluator.colourMean) != 0
+
+        if(self.hasColour):
+            self.colourMean = evaluator.colourMean[rows]
+            self.colourBasis = evaluator.colourBasis.getRows(rows)
+
+        self.texcoords = evaluator.texcoords
+
+    def compact(self, values): # Preview samples only hold the preview vertices
+        return values
+
+    def drawSample(self, shapeCoefficients, expressionCoefficients, colourCoefficients): # Same as ModelEvaluator.drawSample for the preview vertices
+
+        vertices = self.shapeMean + self.shapeBasis.multiply(np.asarray(shapeCoefficients, dtype = np.float32))
+
+        if(self.expressions.columnCount != 0):
+            vertices += self.expressionMean + self.expressions.multiply(np.asarray(expressionCoefficients, dtype = np.float32))
+
+        colours = np.zeros((0, 3), dtype = np.float32)
+
+        if(self.hasColour):
+            colours = (self.colourMean + self.colourBasis.multiply(np.asarray(colourCoefficients, dtype = np.float32))).reshape(-1, 3)
+
+        return ModelSample(vertices.reshape(-1, 3), colours, self.texcoords, None, None, None)
+
+    def getNearestVertex(self, index): # Preview vertex closest to a full resolution vertex, so the eyes stay in place
+
+        if(index >= len(self.meanPositions)): return index # Not a model vertex, the eye check skips it
+
+        return int(np.argmin(np.linalg.norm(self.previewPositions - self.meanPositions[index], axis = 1)))
+
+def getPreviewModel(evaluator, deletionPath, ratio): # Preview for the model without the deleted vertices, None if the faces aren't all triangles
+
+    key = (None if deletionPath == None else (deletionPath, getFileTime(deletionPath)), round(ratio, 3))
+
+    if(key not in evaluator.previews):
+
+        topology = getCompactTopology(evaluator, deletionPath)
+
+        preview = None
+
+        if(topology.vertexCount != 0 and np.all(topology.faceSizes == 3)): preview = PreviewModel(evaluator, topology, ratio)
+
+        evaluator.previews[key] = preview
+
+    return evaluator.previews[key]
+
+def buildMesh(mesh, vertices, topology): # Build the compacted mesh directly with bulk writes, nothing is built just to be deleted
+
+    mesh.clear_geometry()
+
+    mesh.vertices.add(topology.vertexCount)
+    mesh.vertices.foreach_set("co", np.ascontiguousarray(vertices, dtype = np.float32).reshape(-1))
+
+    mesh.loops.add(len(topology.loopVertices))
+    mesh.loops.foreach_set("vertex_index", topology.loopVertices)
+
+    mesh.polygons.add(len(topology.faceSizes))
+    mesh.polygons.foreach_set("loop_start", topology.loopStarts)
+    mesh.polygons.foreach_set("loop_total", topology.faceSizes)
+
+    mesh.update(calc_edges = True)
+
+def refreshColours(mesh, loopColourIndices, colours): # Gather the colour of every loop and write the whole layer at once
+
+    colourLayer = mesh.vertex_colors.get("color")
 
-    fileName = obj.my_settings.VertexFileName
-    filePath = scene.global_setting.GlobalVertexStore
+    if(colourLayer == None):
+        colourLayer = mesh.vertex_colors.new(name = "color")
 
-    if(not os.path.isfile(filePath + fileName)): return # Return None if file doesn't exist
+    loopColours = np.ones((len(loopColourIndices), 4), dtype = np.float32) # Must include alpha
+    loopColours[:, :3] = np.asarray(colours, dtype = np.float32)[loopColourIndices]
 
-    f = open(filePath + fileName, "r")
+    colourLayer.data.foreach_set("color", loopColours.reshape(-1))
+
+def assignUV(mesh, loopUVIndices, textureCoordinates): # Assigns morphable models uv coordinates to the blender object
+
+    if(len(textureCoordinates) == 0): return # Model has no uv coordinates
+
+    if(mesh.uv_layers.active == None):
+        mesh.uv_layers.new()
+
+    loopUV = np.asarray(textureCoordinates, dtype = np.float32)[loopUVIndices]
+
+    mesh.uv_layers.active.data.foreach_set("uv", loopUV.reshape(-1))
+
+def refreshLoopData(mesh, topology, morphModel, shouldSmooth, hasColour): # Write uv, colours and smoothing without a bmesh round trip, returns False if the mesh needs rebuilding
+
+    if(len(mesh.loops) != len(topology.loopVertices)): return False # Mesh doesn't match the model, it needs rebuilding
+
+    if(hasColour):
+        refreshColours(mesh, topology.loopColours, morphModel.colors)
+        assignUV(mesh, topology.loopUVs, morphModel.texcoords)
+    else:
+        assignUV(mesh, topology.loopVertexUVs, morphModel.texcoords) # Models without colour use the vertex index for uv
+
+    smoothObject(mesh, shouldSmooth)
+
+    return True
+
+deletionCache = {} # Deletion file path to its modification time and vertex indices
+
+def loadDeletionVerts(path): # Parse the file once into an int array, parsed again only if the file is saved again
+
+    if(not os.path.isfile(path)): return # Return None if file doesn't exist
+
+    fileTime = os.path.getmtime(path)
+
+    cached = deletionCache.get(path)
+
+    if(cached != None and cached[0] == fileTime): return cached[1]
+
+    f = open(path, "r")
     
-    line = f.readline()
-    line = line.split(",")
+    line = f.readline().strip()
 
     f.close()
 
-    return line
+    deletionVerts = np.unique(np.array([int(v) for v in line.split(",") if v != ""], dtype = np.int64))
 
-def deleteVerts(bmMesh, vertsIndex):
-    
-    verts = [0] * len(vertsIndex)
-    count = 0
+    deletionCache[path] = (fileTime, deletionVerts)
 
-    bmMesh.verts.ensure_lookup_table() # Must be called each time a vertex is changed or deleted (Crashes otherwise)
+    return deletionVerts
 
-    for v in vertsIndex: # Get list of verts to delete (must call above line if you need to look up vertex after deleting) 
+def getDeletionPath(obj): # Path of the deletion file in use, None if vertices aren't being deleted
 
-        verts[count] = bmMesh.verts[int(v)]   
-        count += 1 
+    if(not obj.my_settings.DeleteVertex): return None
+
+    path = bpy.context.scene.global_setting.GlobalVertexStore + obj.my_settings.VertexFileName
+
+    if(not os.path.isfile(path)): return None
+
+    return path
 
-    for v in verts: 
-        bmMesh.verts.remove(v)
-    
 def createVertexMaterial(matName): # Creates a new material and then refreshes (creates) nodes
 
     mat = bpy.data.materials.new(name = matName)
@@ -343,191 +546,1936 @@ def setMaterial(obj): # Create material for obj
 def createMaterials(): #Creates materials required for models
     mat = bpy.data.materials.get("VertexColourMat") # Check to see if material exists in the scene
 
-    imageMat = bpy.data.materials.get("ImageColourMat")
-    
-    if(mat is None): # If mat doesn't exist create it 
-        mat = createVertexMaterial("VertexColourMat")
+    imageMat = bpy.data.materials.get("ImageColourMat")
+    
+    if(mat is None): # If mat doesn't exist create it 
+        mat = createVertexMaterial("VertexColourMat")
+
+    if(imageMat is None):
+        createImageMaterial("ImageColourMat")
+
+def smoothObject(mesh, shouldSmooth):
+    mesh.polygons.foreach_set("use_smooth", np.full(len(mesh.polygons), shouldSmooth, dtype = bool))
+    return
+
+def changedSmooth(self, context): # Called when bool (Smooth) in pannel changes
+    obj = bpy.context.object
+    mesh = obj.data
+    smoothObject(mesh, obj.my_settings.SmoothShader)
+    pass
+
+def addSliderDriver(obj, keyBlock, sliderIndex): # Drive the shape key value straight from the slider, a SUM driver needs no python
+
+    driver = keyBlock.driver_add("value").driver
+    driver.type = 'SUM'
+
+    variable = driver.variables.new()
+    variable.name = "slider"
+    variable.type = 'SINGLE_PROP'
+    variable.targets[0].id_type = 'OBJECT'
+    variable.targets[0].id = obj
+    variable.targets[0].data_path = "sliders.sliderList[" + str(sliderIndex) + "].value"
+
+def createShapeKeys(obj, evaluator): # Basis key plus one key for each blendshape, driven by its expression slider
+
+    obj.shape_key_clear()
+    obj.shape_key_add(name = "Basis", from_mix = False)
+
+    firstExpression = obj.my_settings.ShapeCount + obj.my_settings.ColourCount
+
+    for x in range(0, len(evaluator.expressionNames)):
+
+        keyBlock = obj.shape_key_add(name = evaluator.expressionNames[x], from_mix = False)
+        keyBlock.slider_min = -sliderLimit # Same range as the sliders
+        keyBlock.slider_max = sliderLimit
+
+        addSliderDriver(obj, keyBlock, firstExpression + x)
+
+def refreshShapeKeys(obj, evaluator, identity, topology): # Write the identity shape into the basis key and identity + blendshape into each key
+
+    keys = obj.data.shape_keys
+
+    if(keys == None or len(keys.key_blocks) != len(evaluator.expressionNames) + 1): # Missing or lost in a rebuild
+        createShapeKeys(obj, evaluator)
+        keys = obj.data.shape_keys
+
+    identity = np.ascontiguousarray(identity, dtype = np.float32).reshape(-1)
+
+    keys.key_blocks[0].data.foreach_set("co", topology.compact(identity.reshape(-1, 3)).reshape(-1))
+
+    for x in range(0, len(evaluator.expressionNames)):
+        shape = (identity + evaluator.expressions.getColumn(x)).reshape(-1, 3)
+        keys.key_blocks[x + 1].data.foreach_set("co", topology.compact(shape).reshape(-1))
+
+def getTopologyKey(obj): # Describes what the mesh topology was built from, if it changes the mesh must be rebuilt
+
+    key = obj.my_settings.FilePath + "|" + obj.my_settings.BlendshapePath
+
+    deletionPath = getDeletionPath(obj)
+
+    if(deletionPath != None): # Saving the vertex file again changes which vertices are deleted
+        key += "|" + deletionPath + "|" + str(os.path.getmtime(deletionPath))
+
+    return key
+
+def updateVertexPositions(mesh, vertices): # Write new positions into the existing mesh, faces, uv and colour layers are kept
+
+    co = np.ascontiguousarray(vertices, dtype = np.float32).reshape(-1) # One flat float32 buffer so foreach_set is a single copy
+
+    mesh.vertices.foreach_set("co", co)
+    mesh.update()
+
+def updateModelInPlace(obj, morphModel, topology, topologyKey): # Only move the vertices if the topology is unchanged, returns False if a full rebuild is needed
+
+    mesh = obj.data
+
+    if(obj.my_settings.TopologyKey != topologyKey or len(mesh.vertices) == 0): return False
+
+    verts = topology.compact(morphModel.vertices)
+
+    if(len(verts) != len(mesh.vertices)): return False # Mesh was changed outside the plugin
+
+    updateVertexPositions(mesh, verts)
+
+    return True
+
+class TimingSpan(): # Times one stage while its with block runs
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        self.profiler.record(self.name, time.perf_counter() - self.start)
+        return False
+
+class NoSpan(): # Used when timing is off so the with blocks cost next to nothing
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+noSpan = NoSpan()
+
+class Profiler(): # Rolling timings of each refresh stage, optionally streamed to a JSON lines file
+
+    def __init__(self):
+        self.enabled = False
+        self.stages = OrderedDict() # Stage name to its recent timings in ms, first stage timed is shown first
+        self.objectName = ""
+        self.streamPath = ""
+        self.streamFile = None
+
+    def setOptions(self, enabled, streamPath): # Settings from the scene, only reopens the stream if the path changed
+
+        self.enabled = enabled
+
+        if(not enabled): streamPath = ""
+
+        if(streamPath == self.streamPath): return
+
+        streamFile = None
+
+        if(streamPath != ""):
+            try:
+                streamFile = open(streamPath, "a", buffering = 1) # Line buffered so headless runs that stop early keep their records
+            except OSError as error: # A bad path only stops the stream, refreshes carry on, it is tried again once the path is edited
+                print("Eos Interface: can't open the timing file, timings aren't streamed: " + str(error))
+
+        if(self.streamFile != None): self.streamFile.close()
+
+        self.streamPath = streamPath
+        self.streamFile = streamFile
+
+    def span(self, name):
+        if(not self.enabled): return noSpan
+        return TimingSpan(self, name)
+
+    def record(self, name, seconds):
+
+        milliseconds = seconds * 1000
+
+        timings = self.stages.get(name)
+
+        if(timings == None):
+            timings = self.stages[name] = []
+
+        timings.append(milliseconds)
+        if(len(timings) > timingWindow): del timings[0]
+
+        if(self.streamFile != None):
+            self.streamFile.write(json.dumps({"stage" : name, "ms" : milliseconds, "object" : self.objectName, "time" : time.time()}) + "\n")
+
+    def getSummary(self): # (stage, last, mean, p95) in ms for every stage timed
+        return [(name, timings[-1], float(np.mean(timings)), float(np.percentile(timings, 95))) for name, timings in self.stages.items()]
+
+    def reset(self):
+        self.stages.clear()
+
+profiler = Profiler()
+
+def updateProfiler(scene): # Apply the timing settings, they are read every refresh like the model budget
+    profiler.setOptions(scene.global_setting.EnableTiming, bpy.path.abspath(scene.global_setting.TimingStreamPath))
+
+def refreshModel(obj, sliderTypes, isDrag = False, isRefine = False): # Refresh the model using the slider data, sliderTypes are the kinds of slider changed since the last refresh, isDrag allows the drag preview and progressive evaluation, isRefine only progressive evaluation
+
+    scene = bpy.context.scene
+
+    refreshStart = time.perf_counter()
+
+    shouldSmooth = obj.my_settings.SmoothShader
+
+    with profiler.span("coefficients"):
+        coofficient = getCoefficients(obj) # Grab the coefficients in list form
+
+    if not(coofficient) : return # If there are no coefficients stop
+    
+    mesh = obj.data
+
+    with profiler.span("load model"):
+        loadedModel = getObjectModel(obj)
+
+    evaluator = loadedModel.evaluator
+
+    useShapeKeys = obj.my_settings.UseShapeKeys and len(evaluator.expressionNames) != 0
+
+    if(useShapeKeys): coofficient[2] = [0.0] * len(coofficient[2]) # Shape keys add the expressions, only the identity is evaluated
+
+    topologyKey = getTopologyKey(obj)
+    previewKey = topologyKey + "|preview"
+
+    isPreview = isDrag and scene.global_setting.DragPreview and not useShapeKeys and (sliderTypes != {SliderType.Colour.value} or obj.my_settings.TopologyKey == previewKey) # Colour only changes are cheap at full resolution
+
+    if(isPreview):
+
+        with profiler.span("preview model"):
+            preview = getPreviewModel(evaluator, getDeletionPath(obj), scene.global_setting.PreviewRatio)
+
+        if(preview != None):
+            with profiler.span("preview"):
+                refreshPreview(obj, preview, coofficient, previewKey)
+            return
+
+    previewTimes.pop(obj.name, None) # Already full resolution
+
+    componentLimit = None
+
+    if((isDrag or isRefine) and scene.global_setting.ProgressiveEvaluation): # Only the largest components that fit the frame time, the rest are added while idle
+        componentLimit = evaluator.componentBudget.getLimit(scene.global_setting.TargetFrameTime / 1000)
+
+    drawStart = time.perf_counter()
+
+    with profiler.span("draw sample"):
+
+        resultCache.setBudget(scene.global_setting.ResultCacheBudget)
+
+        resultKey = resultCache.getKey(evaluator, coofficient)
+        result = resultCache.get(resultKey)
+
+        if(result != None): # Evaluated before, only the mesh needs writing
+            morphModel = evaluator.restoreSample(obj.name, coofficient[0], coofficient[2], coofficient[1], result[0], result[1])
+        else:
+            morphModel = evaluator.drawSample(coofficient[0],coofficient[2],coofficient[1], obj.name, componentLimit)
+
+            if(evaluator.states[obj.name].isExact()): resultCache.put(resultKey, morphModel.vertices, morphModel.colors) # Progressive results aren't finished yet
+
+    drawTime = time.perf_counter() - drawStart
+
+    if(scene.global_setting.CheckEvaluator): # Debug mode, compare against eos every refresh
+        with profiler.span("check evaluator"):
+            error, isClose = checkEvaluator(loadedModel.model, morphModel, coofficient[0],coofficient[2],coofficient[1])
+        if(not isClose): print("Eos Interface: evaluator differs from eos draw_sample by " + str(error))
+
+    with profiler.span("vertex deletion"):
+        topology = getCompactTopology(evaluator, getDeletionPath(obj))
+
+    isColourOnly = sliderTypes == {SliderType.Colour.value} and obj.my_settings.ColourCount != 0 # Heads without a colour layer yet still need their vertices if shape changed
+
+    if(isColourOnly and (obj.my_settings.TopologyKey == topologyKey or not mesh.vertex_colors)): # If only colours are changing
+        with profiler.span("colours"):
+            if(mesh.vertex_colors and len(mesh.loops) == len(topology.loopVertices)): # Positions, uvs and smoothing are unchanged, only the colour layer is written
+                refreshColours(mesh, topology.loopColours, morphModel.colors)
+                isUpdated = True
+            else:
+                isUpdated = refreshLoopData(mesh, topology, morphModel, shouldSmooth, True)
+    else:
+        with profiler.span("vertices"):
+            isUpdated = updateModelInPlace(obj, morphModel, topology, topologyKey)
+
+        if(isUpdated and SliderType.Colour.value in sliderTypes and obj.my_settings.ColourCount != 0): # Colours changed along with the shape
+            with profiler.span("colours"):
+                refreshColours(mesh, topology.loopColours, morphModel.colors)
+
+    if(not isUpdated): # If the topology changed rebuild the whole mesh
+
+        if(mesh.shape_keys != None): obj.shape_key_clear() # Keys don't fit the new topology, they are added again below
+
+        with profiler.span("build mesh"):
+            buildMesh(mesh, topology.compact(morphModel.vertices), topology) # Creates new mesh under the same object
+
+        with profiler.span("colours"):
+            refreshLoopData(mesh, topology, morphModel, shouldSmooth, obj.my_settings.ColourCount != 0)
+
+        obj.my_settings.TopologyKey = topologyKey
+
+    if(useShapeKeys and (not isColourOnly or not isUpdated or mesh.shape_keys == None)): # Keys only change with the identity
+        with profiler.span("shape keys"):
+            refreshShapeKeys(obj, evaluator, morphModel.vertices, topology)
+
+    with profiler.span("eyes"):
+        refreshEyes(obj)
+
+    state = evaluator.states[obj.name]
+
+    evaluator.componentBudget.record(state.productLimit, drawTime, time.perf_counter() - refreshStart)
+
+    if(not state.isExact()): scheduleRefinement(obj, state)
+
+def refreshPreview(obj, preview, coefficients, previewKey): # Draw the coarse preview, full resolution comes back once the sliders are idle
+
+    mesh = obj.data
+
+    sample = preview.drawSample(coefficients[0], coefficients[2], coefficients[1])
+
+    if(obj.my_settings.TopologyKey == previewKey and len(mesh.vertices) == preview.vertexCount): # Preview already shown, only move it
+        updateVertexPositions(mesh, sample.vertices)
+        if(preview.hasColour and obj.my_settings.ColourCount != 0): refreshColours(mesh, preview.loopColours, sample.colors)
+    else:
+        if(mesh.shape_keys != None): obj.shape_key_clear()
+
+        buildMesh(mesh, sample.vertices, preview)
+        refreshLoopData(mesh, preview, sample, obj.my_settings.SmoothShader, obj.my_settings.ColourCount != 0)
+
+        obj.my_settings.TopologyKey = previewKey
+
+    refreshEyes(obj, preview.getNearestVertex)
+
+    previewTimes[obj.name] = time.perf_counter()
+
+    if(not bpy.app.timers.is_registered(restoreFullResolution)):
+        bpy.app.timers.register(restoreFullResolution, first_interval = bpy.context.scene.global_setting.PreviewIdle)
+
+def getEyeVertices(text, mapVertex): # Eye vertex indices from the stored text, mapped to the preview vertices while previewing
+    vertices = [int(v) for v in text.split(",")]
+    if(mapVertex != None): vertices = [mapVertex(v) for v in vertices]
+    return vertices
+
+def refreshEyes(obj, mapVertex = None): # Move and scale the linked eyes to the eye vertices
+
+    leftEye, rightEye = getEyes(obj)
+
+    # If the model has left and right eye coordinets move and scale eyes
+    if(leftEye != None and rightEye != None and obj.my_settings.LeftEyeVertices != "" and obj.my_settings.RightEyeVertices != ""):
+
+        leftVertex = getEyeVertices(obj.my_settings.LeftEyeVertices, mapVertex)
+
+        if(int(leftVertex[0]) > len(obj.data.vertices)) : return
+        if(int(leftVertex[1]) > len(obj.data.vertices)) : return
+
+        handleEye(obj, int(leftVertex[0]), int(leftVertex[1]), leftEye, obj.my_settings.EyeScaleOffset, obj.my_settings.LeftEyePosOffset)
+
+        rightVertex = getEyeVertices(obj.my_settings.RightEyeVertices, mapVertex)
+
+        if(int(rightVertex[0]) > len(obj.data.vertices)) : return
+        if(int(rightVertex[1]) > len(obj.data.vertices)) : return
+
+        handleEye(obj, int(rightVertex[0]), int(rightVertex[1]), rightEye, obj.my_settings.EyeScaleOffset, obj.my_settings.RightEyePosOffset)
+
+        rightEye.scale = leftEye.scale # If the user doesn't pick mirrored vertices just use left eye for both scales
+
+        if(not obj.my_settings.DeleteVertex): # Breaks if deleted vertex comes back so the eyes are hidden
+            leftEye.hide_set(True)
+            rightEye.hide_set(True)
+        else:
+            leftEye.hide_set(obj.my_settings.HideEyes)
+            rightEye.hide_set(obj.my_settings.HideEyes)
+
+def handleEye(obj, leftVertex, rightVertex, eye, scaleOffset, posOffset): # Move and scale eye
+
+    leftVec = mathutils.Vector(obj.data.vertices[leftVertex].co)
+    rightVec = mathutils.Vector(obj.data.vertices[rightVertex].co)
+
+    scale = abs((leftVec - rightVec).length) * scaleOffset
+
+    eye.scale = (scale, scale, scale)
+
+    newpos = (leftVec + rightVec) / 2
+
+    eye.location = (newpos[0] * posOffset[0], newpos[1] * posOffset[1], newpos[2] * posOffset[2])
+
+def resize(self, context): # if any of the shape, colour, expression sliders are changed refresh the model
+
+    obj = self.id_data
+
+    if(self.sliderType == SliderType.Expression.value and obj.my_settings.UseShapeKeys): return # Drivers move the shape keys, nothing to evaluate
+
+    if(animatingFrame): return # Written by the animation, the frame change handler refreshes each head once
+
+    if(obj.name in bakeCache): dropBake(obj, "a slider was edited") # The next frame would overwrite the edit with the baked one
+
+    markDirty(obj, self.sliderType, isPanelDrag(context))
+    return
+
+def isPanelDrag(context): # True if the write came from the sliders in the 3D view sidebar, scripts, the console and drivers run with another area or none
+    return context.area != None and context.area.type == "VIEW_3D" and context.region != None and context.region.type == "UI"
+
+dirtyObjects = {} # Object name to the slider types changed since its last refresh
+draggedObjects = set() # Dirty objects whose changes all came from the panel sliders, these can be drawn as a preview
+previewTimes = {} # Object name to when its preview was last drawn
+refiningObjects = {} # Object name to the slider types still missing components after a progressive refresh
+lastRefreshTime = 0.0
+animatingFrame = False # True while the animation writes the sliders of a new frame
+
+def markDirty(obj, sliderType = SliderType.Shape.value, isDrag = False): # Only remember the change, the timer refreshes each object once however many values were written
+
+    if(not isDrag):
+        draggedObjects.discard(obj.name) # Script and button changes are always drawn at full resolution
+    elif(obj.name not in dirtyObjects):
+        draggedObjects.add(obj.name)
+
+    dirtyObjects.setdefault(obj.name, set()).add(sliderType)
+
+    if(bpy.app.timers.is_registered(processDirtyObjects)): return
+
+    refreshRate = bpy.context.scene.global_setting.RefreshRate
+
+    wait = max(0.0, lastRefreshTime + 1.0 / refreshRate - time.perf_counter()) # No more than one refresh per frame at the refresh rate
+
+    bpy.app.timers.register(processDirtyObjects, first_interval = wait)
+
+def processDirtyObjects(): # Timer callback, refreshes every dirty object once
+
+    global lastRefreshTime
+
+    scene = bpy.context.scene
+
+    updateProfiler(scene) # Before the dirty objects are taken, so they aren't lost if it fails
+
+    pending = dict(dirtyObjects)
+    dragged = set(draggedObjects)
+    dirtyObjects.clear()
+    draggedObjects.clear()
+
+    isInteractive = not bpy.app.background # Nobody drags sliders in background mode
+
+    waiting = {} # Heads whose model is still loading in the background, the UI isn't blocked until it is done
+
+    for name, sliderTypes in pending.items():
+
+        obj = bpy.data.objects.get(name)
+
+        if(obj == None): continue # Object may have been deleted since
+
+        if(isInteractive and modelRegistry.isLoading(*getModelPaths(obj))):
+            waiting[name] = sliderTypes
+            continue
+
+        profiler.objectName = name
+        with profiler.span("refresh"):
+            refreshModel(obj, sliderTypes, isInteractive and name in dragged)
+
+    lastRefreshTime = time.perf_counter()
+
+    for name, sliderTypes in waiting.items(): # Kept dirty, later changes are merged in
+        dirtyObjects.setdefault(name, set()).update(sliderTypes)
+        if(name in dragged): draggedObjects.add(name)
+
+    if(len(waiting) != 0): return modelLoadPoll
+
+    return None # Don't repeat, the next change registers the timer again
+
+def restoreFullResolution(): # Timer callback, heads whose sliders have been idle long enough go back to full resolution
+
+    idle = bpy.context.scene.global_setting.PreviewIdle
+    now = time.perf_counter()
+    wait = None
+
+    for name, previewTime in list(previewTimes.items()):
+
+        remaining = previewTime + idle - now
+
+        if(remaining > 0): # Still being dragged, check again once it could be idle
+            wait = remaining if wait == None else min(wait, remaining)
+            continue
+
+        del previewTimes[name]
+
+        obj = bpy.data.objects.get(name)
+
+        if(obj != None): markDirty(obj)
+
+    return wait # None stops the timer
+
+def scheduleRefinement(obj, state): # Add the left out components on later idle ticks
+
+    sliderTypes = set()
+
+    if(state.missingShape is not None): sliderTypes.add(SliderType.Shape.value)
+    if(state.missingColour is not None): sliderTypes.add(SliderType.Colour.value)
+
+    refiningObjects[obj.name] = sliderTypes
+
+    if(not bpy.app.timers.is_registered(refineObjects)):
+        bpy.app.timers.register(refineObjects, first_interval = 1.0 / bpy.context.scene.global_setting.RefreshRate)
+
+def refineObjects(): # Timer callback, each tick adds the next components to heads that aren't being dragged
+
+    for name, sliderTypes in list(refiningObjects.items()):
+
+        if(name in dirtyObjects): continue # A drag refresh is coming, it adds components too
+
+        del refiningObjects[name]
+
+        obj = bpy.data.objects.get(name)
+
+        if(obj != None):
+            profiler.objectName = name
+            with profiler.span("refine"):
+                refreshModel(obj, sliderTypes, isRefine = True) # Puts the object back if it is still not exact, never draws the preview
+
+    if(len(refiningObjects) == 0): return None
+
+    return 1.0 / bpy.context.scene.global_setting.RefreshRate
+
+def flushRefreshes(): # Refresh dirty objects now at full resolution, for scripts and background mode where timers don't run
+
+    for name in list(previewTimes): # Heads still showing a preview
+        obj = bpy.data.objects.get(name)
+        if(obj != None): markDirty(obj)
+
+    for name, sliderTypes in refiningObjects.items(): # Heads still missing components
+        obj = bpy.data.objects.get(name)
+        for sliderType in sliderTypes:
+            if(obj != None): markDirty(obj, sliderType)
+
+    previewTimes.clear()
+    refiningObjects.clear()
+    draggedObjects.clear()
+
+    for timer in (restoreFullResolution, refineObjects):
+        if(bpy.app.timers.is_registered(timer)):
+            bpy.app.timers.unregister(timer)
+
+    if(bpy.app.timers.is_registered(processDirtyObjects)):
+        bpy.app.timers.unregister(processDirtyObjects)
+
+    processDirtyObjects()
+
+def createBlenderMesh(vertices, topology): # Create a blender mesh from the model vertices and topology
+
+    blendObj = bpy.data.meshes.new("Morphable Object")  # add the new mesh    
+    obj = bpy.data.objects.new(blendObj.name, blendObj)
+    col = bpy.data.collections.get("Collection")
+    col.objects.link(obj)
+    bpy.context.view_layer.objects.active = obj
+
+    buildMesh(blendObj, vertices, topology) # Not from_pydata, before Blender 3.0 it can't take the numpy arrays of cached models
+
+    return obj
+
+def toFloatVector(vector): # Eos vectors as contiguous float32 arrays
+    return np.ascontiguousarray(vector, dtype = np.float32).reshape(-1)
+
+def toFloatBasis(basis, rows): # Eos matrices as column contiguous float32 arrays, one column per component
+
+    basis = np.asarray(basis, dtype = np.float32)
+
+    if(basis.size == 0): return np.zeros((rows, 0), dtype = np.float32, order = "F") # Model has no components
+
+    return np.asfortranarray(basis.reshape(rows, -1))
+
+class ModelSample(): # Same data as an eos mesh but the vertices and colours are numpy arrays
+    def __init__(self, vertices, colors, texcoords, tvi, tci, tti):
+        self.vertices = vertices
+        self.colors = colors
+        self.texcoords = texcoords
+        self.tvi = tvi
+        self.tci = tci
+        self.tti = tti
+
+class DenseBasis(): # Basis kept as a column contiguous matrix
+
+    def __init__(self, basis):
+        self.basis = basis
+        self.rows = basis.shape[0]
+        self.columnCount = basis.shape[1]
+        self.nbytes = basis.nbytes
+        self.denseBytes = basis.nbytes
+
+    def multiply(self, coefficients): # Basis * coefficients, missing coefficients are zero
+        return self.basis[:, :len(coefficients)] @ coefficients
+
+    def multiplyColumns(self, columns, values): # Only the given columns * values
+        return self.basis[:, columns] @ values
+
+    def getColumn(self, column):
+        return self.basis[:, column]
+
+    def getRows(self, rows): # Dense copy of only the given rows
+        return DenseBasis(np.asfortranarray(self.basis[rows]))
+
+class QuantisedBasis(): # Basis stored as float16, or int8 with a scale per column, dequantised a block of rows at a time when evaluated
+
+    def __init__(self, basis, precision):
+
+        self.rows = basis.shape[0]
+        self.columnCount = basis.shape[1]
+        self.denseBytes = self.rows * self.columnCount * 4
+
+        if(precision == "INT8"):
+            self.scales = (np.abs(basis).max(axis = 0, initial = 0.0) / 127).astype(np.float32)
+            self.scales[self.scales == 0] = 1 # All zero columns
+            self.basis = np.empty(basis.shape, dtype = np.int8, order = "F")
+
+            for x in range(0, self.columnCount): # One column at a time so no full size temporary is made
+                self.basis[:, x] = np.rint(basis[:, x] / self.scales[x])
+        else:
+            self.scales = np.ones(self.columnCount, dtype = np.float32) # Float16 needs no scale
+            self.basis = np.asfortranarray(basis, dtype = np.float16)
+
+        self.nbytes = self.basis.nbytes + self.scales.nbytes
+
+    def multiply(self, coefficients): # Basis * coefficients, the scales are folded into the coefficients so only the stored values are converted
+
+        columns = len(coefficients)
+        coefficients = np.asarray(coefficients, dtype = np.float32) * self.scales[:columns]
+
+        result = np.empty(self.rows, dtype = np.float32)
+
+        for start in range(0, self.rows, quantisedBlockRows): # Dequantising all rows at once would need a float32 copy of the whole basis
+            end = min(start + quantisedBlockRows, self.rows)
+            result[start:end] = self.basis[start:end, :columns].astype(np.float32) @ coefficients
+
+        return result
+
+    def multiplyColumns(self, columns, values): # Only the given columns * values
+        return self.basis[:, columns].astype(np.float32) @ (np.asarray(values, dtype = np.float32) * self.scales[columns])
+
+    def getColumn(self, column):
+        return self.basis[:, column].astype(np.float32) * self.scales[column]
+
+    def getRows(self, rows): # Dense float32 copy of only the given rows
+        return DenseBasis(np.asfortranarray(self.basis[rows].astype(np.float32) * self.scales))
+
+def createPcaBasis(basis, precision): # Full precision unless a quantised precision is picked
+    if(precision == "FLOAT32"): return DenseBasis(basis)
+    return QuantisedBasis(basis, precision)
+
+class SparseBasis(): # Blendshapes only move part of the face, so only the non zero offsets are kept, compressed by column (CSC, not CSR) because a sample only reads the columns of its non zero sliders and a delta adds one column
+
+    def __init__(self, columns, rows, threshold): # columns gives one dense blendshape at a time, so the dense matrix is never built
+
+        values = []
+        rowIndices = []
+        counts = []
+
+        for column in columns:
+
+            nonZero = np.flatnonzero(np.abs(column) > threshold)
+
+            values.append(np.asarray(column[nonZero], dtype = np.float32))
+            rowIndices.append(nonZero.astype(np.int32))
+            counts.append(len(nonZero))
+
+        self.rows = rows
+        self.columnCount = len(counts)
+        self.values = np.concatenate(values) if values else np.zeros(0, dtype = np.float32)
+        self.rowIndices = np.concatenate(rowIndices) if rowIndices else np.zeros(0, dtype = np.int32)
+        self.columnStarts = np.concatenate(([0], np.cumsum(counts))).astype(np.int64) # Column x is values[columnStarts[x]:columnStarts[x + 1]]
+
+        self.nbytes = self.values.nbytes + self.rowIndices.nbytes + self.columnStarts.nbytes
+        self.denseBytes = rows * self.columnCount * 4
+        self.density = len(self.values) / max(1, rows * self.columnCount)
+
+    def multiplyColumns(self, columns, values): # Sum of the given columns * values, costs the kept values of those columns only
+
+        result = np.zeros(self.rows, dtype = np.float32)
+
+        columns = np.asarray(columns, dtype = np.int64)
+        values = np.asarray(values, dtype = np.float32)
+
+        if(len(columns) <= sparseColumnLoop): # Few columns, add each one in place
+
+            for column, value in zip(columns, values):
+                start, end = self.columnStarts[column], self.columnStarts[column + 1]
+                result[self.rowIndices[start:end]] += self.values[start:end] * value
+
+            return result
+
+        starts = self.columnStarts[columns]
+        counts = self.columnStarts[columns + 1] - starts
+
+        entries = np.repeat(starts - np.concatenate(([0], np.cumsum(counts)[:-1])), counts) + np.arange(counts.sum()) # Positions of every kept value in the columns
+        weights = self.values[entries] * np.repeat(values, counts)
+
+        result += np.bincount(self.rowIndices[entries], weights = weights, minlength = self.rows).astype(np.float32)
+
+        return result
+
+    def multiply(self, coefficients): # Basis * coefficients, columns with a zero coefficient are skipped (most expression sliders are usually zero)
+
+        coefficients = np.asarray(coefficients, dtype = np.float32)
+
+        used = np.flatnonzero(coefficients)
+
+        return self.multiplyColumns(used, coefficients[used])
+
+    def getColumn(self, column):
+        dense = np.zeros(self.rows, dtype = np.float32)
+        start, end = self.columnStarts[column], self.columnStarts[column + 1]
+        dense[self.rowIndices[start:end]] = self.values[start:end]
+        return dense
+
+    def getRows(self, rows): # Dense copy of only the given rows, a small row subset is cheaper to keep dense
+
+        positions = np.full(self.rows, -1, dtype = np.int64)
+        positions[rows] = np.arange(len(rows))
+
+        columns = np.repeat(np.arange(self.columnCount), np.diff(self.columnStarts))
+        entries = positions[self.rowIndices]
+        isKept = entries >= 0
+
+        dense = np.zeros((len(rows), self.columnCount), dtype = np.float32, order = "F")
+        dense[entries[isKept], columns[isKept]] = self.values[isKept]
+
+        return DenseBasis(dense)
+
+def createBlendshapeBasis(blendshapes, rows, threshold): # Sparse storage unless the blendshapes are mostly non zero, the dense matrix is only built in that case
+
+    sparse = SparseBasis((toFloatVector(b.deformation) for b in blendshapes), rows, threshold)
+
+    if(sparse.nbytes < sparse.denseBytes): return sparse # Each kept value costs a float and an index, so sparse must be under half full
+
+    return DenseBasis(np.asfortranarray(np.stack([toFloatVector(b.deformation) for b in blendshapes], axis = 1)))
+
+class EvaluationState(): # The last coefficients and buffers evaluated for one object, so a slider change only adds its own column
+    def __init__(self):
+        self.shapeCoefficients = None
+        self.expressionCoefficients = None
+        self.colourCoefficients = None
+        self.identity = None # Shape mean + shape basis part of the vertices
+        self.expressionOffset = None # Expression part of the vertices, None if the model has no expressions
+        self.vertices = None
+        self.colours = None
+        self.deltaUpdates = 0
+        self.missingShape = None # Mask of the shape components not added to the vertices yet, None when they are exact
+        self.missingColour = None
+        self.productLimit = None # Components per basis in the last full product, None if only deltas were added
+
+    def isExact(self):
+        return self.missingShape is None and self.missingColour is None
+
+def getChangedCoefficients(old, new): # Indices and differences of the coefficients that changed, None if a full recompute is cheaper
+
+    if(old is None or len(old) != len(new)): return None
+
+    changed = np.flatnonzero(old != new)
+
+    if(len(changed) * 4 > len(new)): return None # Too many changes, one full matrix-vector product is faster
+
+    return changed, new[changed] - old[changed]
+
+def getComponentOrder(pcaModel, columnCount): # Columns from the largest eigenvalue down, None if they are already in that order (eos sorts them)
+
+    eigenvalues = toFloatVector(pcaModel.get_eigenvalues())
+
+    if(len(eigenvalues) != columnCount): return None
+
+    order = np.argsort(-eigenvalues, kind = "stable")
+
+    if(np.array_equal(order, np.arange(columnCount))): return None
+
+    return order
+
+def getLeadingProduct(basis, order, coefficients, limit): # Basis * only the limit largest components, and a mask of the non zero components left out
+
+    count = len(coefficients)
+    missing = np.zeros(count, dtype = bool)
+
+    if(order is None): # The largest components are the first columns
+        missing[limit:] = coefficients[limit:] != 0
+        return basis.multiply(coefficients[:limit]), missing
+
+    columns = order[order < count]
+    used = columns[:limit]
+
+    missing[columns[limit:]] = True
+    missing &= coefficients != 0
+
+    return basis.multiplyColumns(used, coefficients[used]), missing
+
+def getMissingProduct(basis, order, coefficients, missing, limit): # Basis * the next limit left out components (all of them for None), they are cleared from the mask
+
+    columns = np.flatnonzero(missing) if order is None else order[order < len(missing)]
+    if(order is not None): columns = columns[missing[columns]]
+
+    if(limit != None): columns = columns[:limit]
+
+    missing[columns] = False
+
+    return basis.multiplyColumns(columns, coefficients[columns])
+
+def removeMissing(change, missing): # Only the changed columns already in the buffer, left out columns are added with their newest value later
+    if(missing is None): return change
+    isAdded = ~missing[change[0]]
+    return change[0][isAdded], change[1][isAdded]
+
+class ComponentBudget(): # Picks how many components a dragged refresh evaluates to stay within the target frame time, from the cost of earlier refreshes
+
+    def __init__(self):
+        self.componentTime = None # Seconds per component of a full product, smoothed
+        self.overhead = 0.0 # Seconds a refresh spends outside evaluation (writing the mesh, eyes)
+        self.limit = None # Components used by the last dragged refresh, shown in the panel
+
+    def record(self, components, evaluationTime, refreshTime):
+
+        if(components): # Only full products say what a component costs, deltas are a few columns
+            componentTime = evaluationTime / components
+            self.componentTime = componentTime if self.componentTime == None else self.componentTime * 0.8 + componentTime * 0.2
+
+        self.overhead = self.overhead * 0.8 + max(0.0, refreshTime - evaluationTime) * 0.2
+
+    def getLimit(self, frameTime): # None until a refresh has been timed, that refresh evaluates everything
+
+        if(self.componentTime == None): return None
+
+        self.limit = max(minimumComponents, int((frameTime - self.overhead) / self.componentTime))
+
+        return self.limit
+
+evaluatorIds = itertools.count() # Every set of bases gets a new id for the result cache
+
+class ModelEvaluator(): # The morphable model pulled out of eos once, a sample is then one matrix-vector product per sub model
+
+    def __init__(self, model, blendshapeThreshold = 0.0, precision = "FLOAT32"):
+
+        self.shapeMean = toFloatVector(model.get_shape_model().get_mean())
+        self.colourMean = toFloatVector(model.get_color_model().get_mean())
+
+        self.setPrecision(model, precision)
+
+        self.expressionMean = np.zeros(len(self.shapeMean), dtype = np.float32)
+        self.expressionNames = [] # Blendshape names, used for shape keys
+
+        self.setExpressions(model, blendshapeThreshold)
+
+        topology = model.draw_sample([0,0,0],[0,0,0]) # Topology and uv never change so keep them from one sample
+
+        self.texcoords = np.asarray(topology.texcoords, dtype = np.float32).reshape(-1, 2)
+        self.tvi = topology.tvi
+        self.tci = topology.tci
+        self.tti = topology.tti
+        self.faceSizes = model.faceSizes if isinstance(model, CachedModel) else np.array([len(face) for face in self.tvi], dtype = np.int32) # Cached faces are stored flat
+
+        self.vertexCount = len(self.shapeMean) // 3
+
+        self.states = {} # EvaluationState for each object using this model
+        self.topologies = {} # CompactTopology for each deletion file, built when first needed
+        self.previews = {} # PreviewModel for each deletion file and preview detail, built when first dragged
+
+    def setPrecision(self, model, precision): # Build the shape and colour bases, FLOAT32, FLOAT16 or INT8
+
+        self.shapeBasis = createPcaBasis(toFloatBasis(model.get_shape_model().get_rescaled_pca_basis(), len(self.shapeMean)), precision)
+        self.colourBasis = createPcaBasis(toFloatBasis(model.get_color_model().get_rescaled_pca_basis(), len(self.colourMean)), precision)
+        self.precision = precision
+
+        self.shapeOrder = getComponentOrder(model.get_shape_model(), self.shapeBasis.columnCount) # Progressive refreshes add the largest components first
+        self.colourOrder = getComponentOrder(model.get_color_model(), self.colourBasis.columnCount)
+        self.componentBudget = ComponentBudget() # Component costs change with the precision
+        self.resultId = next(evaluatorIds) # Cached results of the old bases must not be used
+
+        self.states = {} # Kept buffers were made with the old bases
+        self.previews = {}
+
+    def setExpressions(self, model, blendshapeThreshold): # Build the expression basis, blendshapes are stored sparse with offsets up to the threshold dropped
+
+        self.expressions = DenseBasis(np.zeros((len(self.shapeMean), 0), dtype = np.float32, order = "F"))
+        self.blendshapeThreshold = blendshapeThreshold
+
+        modelType = model.get_expression_model_type()
+
+        if(modelType == model.ExpressionModelType.Blendshapes): # Each blendshape is a column of offsets
+            blendshapes = model.get_expression_model()
+            self.expressions = createBlendshapeBasis(blendshapes, len(self.shapeMean), blendshapeThreshold)
+            self.expressionNames = [b.name if b.name != "" else "Blendshape " + str(x) for x, b in enumerate(blendshapes)]
+
+        elif(modelType != model.ExpressionModelType(0)): # Pca expression model
+            expressionModel = model.get_expression_model()
+            self.expressionMean = toFloatVector(expressionModel.get_mean())
+            self.expressions = DenseBasis(toFloatBasis(expressionModel.get_rescaled_pca_basis(), len(self.expressionMean)))
+
+        self.states = {} # Kept buffers were made with the old basis
+        self.previews = {}
+        self.resultId = next(evaluatorIds)
+
+    def evaluateIdentity(self, shapeCoefficients): # Shape mean + basis * coefficients, missing coefficients are zero like in eos
+        return self.shapeMean + self.shapeBasis.multiply(np.asarray(shapeCoefficients, dtype = np.float32))
+
+    def evaluateExpressions(self, expressionCoefficients): # Offset the expressions add to the identity, None if the model has no expressions
+
+        if(self.expressions.columnCount == 0): return None
+
+        return self.expressionMean + self.expressions.multiply(np.asarray(expressionCoefficients, dtype = np.float32))
+
+    def evaluateShape(self, shapeCoefficients, expressionCoefficients): # Identity + expression offset, same as the eos sample vertices
+
+        vertices = self.evaluateIdentity(shapeCoefficients)
+
+        offset = self.evaluateExpressions(expressionCoefficients)
+
+        if(offset is not None): vertices += offset
+
+        return vertices.reshape(-1, 3)
+
+    def evaluateColour(self, colourCoefficients):
+
+        if(len(self.colourMean) == 0): return np.zeros((0, 3), dtype = np.float32) # Model has no colour
+
+        colourCoefficients = np.asarray(colourCoefficients, dtype = np.float32)
+
+        colours = self.colourMean + self.colourBasis.multiply(colourCoefficients)
+
+        return colours.reshape(-1, 3)
+
+    def evaluateLeadingIdentity(self, shapeCoefficients, limit): # evaluateIdentity with only the limit largest components, and a mask of those left out
+
+        product, missing = getLeadingProduct(self.shapeBasis, self.shapeOrder, shapeCoefficients, limit)
+
+        return self.shapeMean + product, missing
+
+    def evaluateLeadingColour(self, colourCoefficients, limit):
+
+        if(len(self.colourMean) == 0): return self.evaluateColour(colourCoefficients).reshape(-1), None
+
+        product, missing = getLeadingProduct(self.colourBasis, self.colourOrder, colourCoefficients, limit)
+
+        return self.colourMean + product, missing
+
+    def splitVertices(self, state): # A restored result only keeps the vertices, take the expression offset back out to get the identity
+
+        state.expressionOffset = self.evaluateExpressions(state.expressionCoefficients)
+        state.identity = state.vertices if state.expressionOffset is None else state.vertices - state.expressionOffset
+
+    def updateState(self, state, shapeCoefficients, expressionCoefficients, colourCoefficients, limit = None): # Apply only the changed coefficients to the kept buffers, limit leaves out all but the largest components of a full product
+
+        shapeChange = getChangedCoefficients(state.shapeCoefficients, shapeCoefficients)
+        expressionChange = getChangedCoefficients(state.expressionCoefficients, expressionCoefficients)
+        colourChange = getChangedCoefficients(state.colourCoefficients, colourCoefficients)
+
+        isFull = state.deltaUpdates >= fullRecomputeInterval # Recompute now and then so float error stays bounded
+        isShapeProduct = isFull or shapeChange == None
+        isExpressionProduct = isFull or expressionChange == None
+        isColourProduct = isFull or colourChange == None
+
+        state.productLimit = None
+
+        if(isShapeProduct or isColourProduct): # Components per basis multiplied, to time them
+            state.productLimit = max(self.shapeBasis.columnCount, self.colourBasis.columnCount) if limit == None else limit
+
+        if(state.identity is None and state.vertices is not None and not (isShapeProduct and isExpressionProduct)): self.splitVertices(state)
+
+        identity = state.identity # Identity, expression offset and colour are each kept, a part is only recomputed if its own coefficients changed
+
+        if(isShapeProduct and limit == None):
+            identity = self.evaluateIdentity(shapeCoefficients)
+            state.missingShape = None
+        elif(isShapeProduct):
+            identity, state.missingShape = self.evaluateLeadingIdentity(shapeCoefficients, limit)
+        elif(len(shapeChange[0]) != 0):
+            identity = identity + self.shapeBasis.multiplyColumns(*removeMissing(shapeChange, state.missingShape)) # O(V) per changed slider instead of O(V*K), buffers handed out before stay untouched
+
+        if(not isShapeProduct and state.missingShape is not None): # Add the next left out components, or all of them for an exact refresh
+            identity = identity + getMissingProduct(self.shapeBasis, self.shapeOrder, shapeCoefficients, state.missingShape, limit)
+            if(not state.missingShape.any()): state.missingShape = None
+
+        offset = state.expressionOffset
+
+        if(isExpressionProduct):
+            offset = self.evaluateExpressions(expressionCoefficients) # Expressions are always exact, blendshapes are sparse and pca expression models small
+        elif(len(expressionChange[0]) != 0):
+            offset = offset + self.expressions.multiplyColumns(expressionChange[0], expressionChange[1])
+
+        if(identity is not state.identity or offset is not state.expressionOffset): # Only add the parts up again if one of them changed
+            state.vertices = identity if offset is None else identity + offset
+
+        state.identity = identity
+        state.expressionOffset = offset
+
+        if(isColourProduct and limit == None):
+            state.colours = self.evaluateColour(colourCoefficients).reshape(-1)
+            state.missingColour = None
+        elif(isColourProduct):
+            state.colours, state.missingColour = self.evaluateLeadingColour(colourCoefficients, limit)
+        elif(len(colourChange[0]) != 0):
+            state.colours = state.colours + self.colourBasis.multiplyColumns(*removeMissing(colourChange, state.missingColour))
+
+        if(not isColourProduct and state.missingColour is not None):
+            state.colours = state.colours + getMissingProduct(self.colourBasis, self.colourOrder, colourCoefficients, state.missingColour, limit)
+            if(not state.missingColour.any()): state.missingColour = None
+
+        state.deltaUpdates = 0 if isFull else state.deltaUpdates + 1
+
+        state.shapeCoefficients = shapeCoefficients
+        state.expressionCoefficients = expressionCoefficients
+        state.colourCoefficients = colourCoefficients
+
+    def drawSample(self, shapeCoefficients, expressionCoefficients, colourCoefficients, key = None, componentLimit = None): # Same arguments as eos draw_sample, giving a key keeps the buffers for delta updates, componentLimit evaluates progressively
+
+        if(key == None):
+            vertices = self.evaluateShape(shapeCoefficients, expressionCoefficients)
+            colours = self.evaluateColour(colourCoefficients)
+
+            return ModelSample(vertices, colours, self.texcoords, self.tvi, self.tci, self.tti)
+
+        state = self.states.get(key)
+
+        if(state == None):
+            state = EvaluationState()
+            self.states[key] = state
+
+        shapeCoefficients = np.asarray(shapeCoefficients, dtype = np.float32)
+        expressionCoefficients = np.asarray(expressionCoefficients, dtype = np.float32)
+        colourCoefficients = np.asarray(colourCoefficients, dtype = np.float32)
+
+        self.updateState(state, shapeCoefficients, expressionCoefficients, colourCoefficients, componentLimit)
+
+        return ModelSample(state.vertices.reshape(-1, 3), state.colours.reshape(-1, 3), self.texcoords, self.tvi, self.tci, self.tti)
+
+    def restoreSample(self, key, shapeCoefficients, expressionCoefficients, colourCoefficients, vertices, colours): # Make a cached result the kept buffers of the key, later slider changes add their deltas to it
+
+        state = self.states.get(key)
+
+        if(state == None):
+            state = EvaluationState()
+            self.states[key] = state
+
+        state.shapeCoefficients = np.asarray(shapeCoefficients, dtype = np.float32)
+        state.expressionCoefficients = np.asarray(expressionCoefficients, dtype = np.float32)
+        state.colourCoefficients = np.asarray(colourCoefficients, dtype = np.float32)
+        state.vertices = vertices.reshape(-1) # Deltas never write into kept buffers so the cached arrays are shared, not copied
+        state.colours = colours.reshape(-1)
+        state.identity = None # Split out of the vertices when a shape or expression slider next changes
+        state.expressionOffset = None
+        state.missingShape = None
+        state.missingColour = None
+        state.productLimit = None
+
+        return ModelSample(vertices, colours, self.texcoords, self.tvi, self.tci, self.tti)
+
+    def invalidate(self, key): # Forget the kept buffers so the next sample is computed from scratch
+        self.states.pop(key, None)
+
+    def getSize(self): # Bytes held by the numpy copy of the model
+        arrays = (self.shapeMean, self.shapeBasis, self.colourMean, self.colourBasis, self.expressionMean, self.texcoords, self.expressions)
+        return sum(a.nbytes for a in arrays)
+
+    def getExpressionSummary(self): # Text for the panel, the evaluator's blendshape memory against a dense copy (the eos model keeps its own dense blendshapes)
+
+        if(not isinstance(self.expressions, SparseBasis)): return ""
+
+        return "Blendshapes: " + str(round(self.expressions.density * 100, 1)) + "% non zero, evaluator copy " + str(round(self.expressions.nbytes / (1024 * 1024), 1)) + " MB instead of " + str(round(self.expressions.denseBytes / (1024 * 1024), 1)) + " MB"
+
+def getPrecisionReport(loadedModel, draws = 10, seed = 0): # Max and RMS vertex error of every basis precision against eos draw_sample over random coefficients
+
+    model = loadedModel.model
+    evaluator = loadedModel.evaluator
+    counts = (evaluator.shapeBasis.columnCount, evaluator.colourBasis.columnCount, evaluator.expressions.columnCount)
+
+    generator = np.random.default_rng(seed)
+    draws = [np.split(getRandomCoefficients(counts, (1.0, 1.0, 1.0), generator), np.cumsum(counts)[:2]) for x in range(0, draws)] # Shape, colour, expression
+
+    references = [np.asarray(model.draw_sample(shape, expression, colour).vertices, dtype = np.float32).reshape(-1, 3) for shape, colour, expression in draws]
+
+    report = []
+
+    for precision, name, description in basisPrecisions:
+
+        testEvaluator = evaluator if precision == evaluator.precision else ModelEvaluator(model, evaluator.blendshapeThreshold, precision)
+
+        distances = np.concatenate([np.linalg.norm(testEvaluator.drawSample(shape, expression, colour).vertices - reference, axis = 1) for (shape, colour, expression), reference in zip(draws, references)])
+
+        size = (testEvaluator.shapeBasis.nbytes + testEvaluator.colourBasis.nbytes) / (1024 * 1024)
+
+        report.append(name + ": max " + "%.2e" % distances.max(initial = 0.0) + "  RMS " + "%.2e" % np.sqrt(np.mean(distances ** 2)) + "  " + str(round(size, 1)) + " MB")
+
+    return report
+
+def checkEvaluator(model, sample, shapeCoefficients, expressionCoefficients, colourCoefficients, tolerance = evaluatorTolerance): # Compare a fast sample against eos, returns the largest difference and if it is within tolerance
+
+    eosSample = model.draw_sample(shapeCoefficients, expressionCoefficients, colourCoefficients)
+
+    vertexError = np.abs(np.asarray(eosSample.vertices, dtype = np.float32) - sample.vertices).max(initial = 0.0)
+    colourError = 0.0
+
+    if(len(eosSample.colors) != 0):
+        colourError = np.abs(np.asarray(eosSample.colors, dtype = np.float32) - sample.colors).max(initial = 0.0)
+
+    scale = max(1.0, np.abs(sample.vertices).max(initial = 0.0)) # Float32 error grows with the size of the model
+
+    return max(vertexError, colourError), vertexError <= tolerance * scale and colourError <= tolerance
+
+def loadEosModel(modelPath, blendshapePath = ""): # Load the model from its cache if it has an up to date one, otherwise through eos
+
+    cachedModel = loadModelCache(modelPath, blendshapePath)
+
+    if(cachedModel != None): return cachedModel
+
+    return parseEosModel(modelPath, blendshapePath)
+
+def parseEosModel(modelPath, blendshapePath = ""): # Load the eos model, combining it with the blendshape file if it has no expressions
+
+    model = eos.morphablemodel.load_model(modelPath)
+
+    modelType = model.get_expression_model_type()
+
+    if(modelType == model.ExpressionModelType(0) and blendshapePath != ""):
+
+        blendshapes = eos.morphablemodel.load_blendshapes(blendshapePath)
+        
+        return eos.morphablemodel.MorphableModel(model.get_shape_model(), blendshapes,
+                                                                        color_model=eos.morphablemodel.PcaModel(),
+                                                                        vertex_definitions=None,
+                                                                        texture_coordinates=model.get_texture_coordinates())
+
+    return model
+
+def getFileTime(path): # Modification time of a file, 0 if it doesn't exist
+    if(os.path.isfile(path)): return os.path.getmtime(path)
+    return 0
+
+class CachedPcaModel(): # The parts of an eos PcaModel the plugin uses, read from a model cache
+
+    def __init__(self, mean, basis, eigenvalues):
+        self.mean = mean
+        self.basis = basis
+        self.eigenvalues = eigenvalues
+
+    def get_mean(self):
+        return self.mean
+
+    def get_rescaled_pca_basis(self):
+        return self.basis
+
+    def get_eigenvalues(self):
+        return self.eigenvalues
+
+    def get_num_principal_components(self):
+        return self.basis.shape[1]
+
+    def get_data_dimension(self):
+        return len(self.mean)
+
+    def draw_sample(self, coefficients): # Mean + basis * coefficients, missing coefficients are zero like in eos
+        coefficients = np.asarray(coefficients, dtype = np.float32)[:self.basis.shape[1]]
+        return self.mean + self.basis[:, :len(coefficients)] @ coefficients
+
+class CachedBlendshape():
+    def __init__(self, name, deformation):
+        self.name = name
+        self.deformation = deformation
+
+class CachedModel(): # Stands in for an eos MorphableModel, every array is memory mapped from the cache so loading is near instant
+
+    ExpressionModelType = eos.morphablemodel.MorphableModel.ExpressionModelType
+
+    def __init__(self, folder, info):
+
+        def load(name): # Pages are read when first touched and shared with every other process mapping the same file
+            return np.load(os.path.join(folder, name + ".npy"), mmap_mode = "r")
+
+        self.shapeModel = CachedPcaModel(load("shape_mean"), load("shape_basis"), load("shape_eigenvalues"))
+        self.colourModel = CachedPcaModel(load("colour_mean"), load("colour_basis"), load("colour_eigenvalues"))
+        self.expressionType = self.ExpressionModelType(info["expressionType"])
+        self.expressionModel = None
+
+        if(self.expressionType == self.ExpressionModelType.Blendshapes):
+            deformations = load("expression_basis")
+            self.expressionModel = [CachedBlendshape(name, deformations[:, x]) for x, name in enumerate(info["expressionNames"])]
+
+        elif(self.expressionType != self.ExpressionModelType(0)):
+            self.expressionModel = CachedPcaModel(load("expression_mean"), load("expression_basis"), load("expression_eigenvalues"))
+
+        self.texcoords = load("texcoords")
+        self.tvi = load("tvi")
+        self.tci = load("tci")
+        self.tti = load("tti")
+        self.faceSizes = load("face_sizes")
+
+    def get_shape_model(self):
+        return self.shapeModel
+
+    def get_color_model(self):
+        return self.colourModel
+
+    def get_expression_model(self):
+        return self.expressionModel
+
+    def get_expression_model_type(self):
+        return self.expressionType
+
+    def get_texture_coordinates(self):
+        return self.texcoords
+
+    def has_color_model(self):
+        return len(self.colourModel.mean) != 0
+
+    def draw_sample(self, shapeCoefficients, expressionCoefficients, colourCoefficients = None): # Same as eos, draw_sample(shape, colour) for models without expressions
+
+        if(colourCoefficients is None): expressionCoefficients, colourCoefficients = [], expressionCoefficients
+
+        vertices = self.shapeModel.draw_sample(shapeCoefficients)
+
+        if(self.expressionType == self.ExpressionModelType.Blendshapes):
+            for blendshape, coefficient in zip(self.expressionModel, expressionCoefficients):
+                vertices = vertices + blendshape.deformation * np.float32(coefficient)
+
+        elif(self.expressionType != self.ExpressionModelType(0)):
+            vertices = vertices + self.expressionModel.draw_sample(expressionCoefficients)
+
+        colours = self.colourModel.draw_sample(colourCoefficients).reshape(-1, 3) if self.has_color_model() else np.zeros((0, 3), dtype = np.float32)
+
+        return ModelSample(vertices.reshape(-1, 3), colours, self.texcoords, self.tvi, self.tci, self.tti)
+
+def getModelCachePath(modelPath, blendshapePath = ""): # Cache folder next to the model, one for each model and blendshape file pair
+
+    folder = os.path.splitext(modelPath)[0]
+
+    if(blendshapePath != ""): folder += "_" + os.path.splitext(os.path.basename(blendshapePath))[0]
+
+    return folder + "_cache"
+
+def getModelCacheSource(modelPath, blendshapePath): # What the cache was made from, a changed model file makes the cache stale
+    return {"version" : modelCacheVersion, "model" : os.path.abspath(modelPath), "modelTime" : getFileTime(modelPath),
+            "blendshapes" : os.path.abspath(blendshapePath) if blendshapePath != "" else "", "blendshapeTime" : getFileTime(blendshapePath)}
+
+def loadModelCache(modelPath, blendshapePath = ""): # The cached model, None if there is no cache or it is out of date
+
+    folder = getModelCachePath(modelPath, blendshapePath)
+    infoPath = os.path.join(folder, "info.json")
+
+    if(not os.path.isfile(infoPath)): return None
+
+    with open(infoPath) as infoFile:
+        info = json.load(infoFile)
+
+    if(info.get("source") != getModelCacheSource(modelPath, blendshapePath)): return None # Made from an older model file
+
+    return CachedModel(folder, info)
+
+def saveModelCacheBasis(folder, name, pcaModel, rows): # Mean, rescaled basis and eigenvalues of a pca model
+
+    np.save(os.path.join(folder, name + "_mean.npy"), toFloatVector(pcaModel.get_mean()))
+    np.save(os.path.join(folder, name + "_basis.npy"), toFloatBasis(pcaModel.get_rescaled_pca_basis(), rows))
+    np.save(os.path.join(folder, name + "_eigenvalues.npy"), toFloatVector(pcaModel.get_eigenvalues()))
+
+def convertModelCache(modelPath, blendshapePath = ""): # Parse the model with eos once and write every array as .npy files, returns the cache folder
+
+    model = parseEosModel(modelPath, blendshapePath)
+    folder = getModelCachePath(modelPath, blendshapePath)
+
+    partFolder = folder + "_part" # Written beside the cache and moved into place so a stopped conversion is never loaded
+    os.makedirs(partFolder, exist_ok = True)
+
+    shapeModel = model.get_shape_model()
+    rows = len(shapeModel.get_mean())
+
+    saveModelCacheBasis(partFolder, "shape", shapeModel, rows)
+    saveModelCacheBasis(partFolder, "colour", model.get_color_model(), len(model.get_color_model().get_mean()))
+
+    modelType = model.get_expression_model_type()
+    info = {"source" : getModelCacheSource(modelPath, blendshapePath), "expressionType" : int(modelType), "expressionNames" : []}
+
+    if(modelType == model.ExpressionModelType.Blendshapes):
+        blendshapes = model.get_expression_model()
+        np.save(os.path.join(partFolder, "expression_basis.npy"), np.asfortranarray(np.stack([toFloatVector(b.deformation) for b in blendshapes], axis = 1)))
+        info["expressionNames"] = [b.name for b in blendshapes]
+
+    elif(modelType != model.ExpressionModelType(0)):
+        saveModelCacheBasis(partFolder, "expression", model.get_expression_model(), rows)
+
+    sample = model.draw_sample([0,0,0],[0,0,0]) # Topology and uv
+
+    np.save(os.path.join(partFolder, "texcoords.npy"), np.asarray(sample.texcoords, dtype = np.float32).reshape(-1, 2))
+    for name in ("tvi", "tci", "tti"): # Flat, faces aren't always triangles and models without uv faces have no tti
+        np.save(os.path.join(partFolder, name + ".npy"), flattenFaces(getattr(sample, name)))
+    np.save(os.path.join(partFolder, "face_sizes.npy"), np.array([len(face) for face in sample.tvi], dtype = np.int32))
+
+    with open(os.path.join(partFolder, "info.json"), "w") as infoFile:
+        json.dump(info, infoFile, indent = 2)
+
+    if(os.path.isdir(folder)): # Replace an out of date cache
+        for name in os.listdir(folder): os.remove(os.path.join(folder, name))
+        os.rmdir(folder)
+
+    os.rename(partFolder, folder)
+
+    return folder
+
+class LoadedModel(): # A model in the registry, the eos model and the numpy evaluator built from it
+    def __init__(self, model, modelPath, blendshapePath, blendshapeThreshold, precision = "FLOAT32"):
+        self.model = model
+        self.modelPath = modelPath
+        self.blendshapePath = blendshapePath
+        self.evaluator = ModelEvaluator(model, blendshapeThreshold, precision)
+        self.precisionReport = [] # Lines of the last precision check
+        self.updateSize()
+
+    def updateSize(self): # Estimate, eos keeps an orthonormal and a rescaled basis and dense blendshapes next to our copy
+        evaluator = self.evaluator
+        self.size = evaluator.getSize()
+
+        if(not isinstance(self.model, CachedModel)): # Cached models are memory mapped, there is no second copy
+            self.size += (evaluator.shapeBasis.denseBytes + evaluator.colourBasis.denseBytes) * 2 + evaluator.expressions.denseBytes
+
+class ModelLoad(): # A model loading on a worker thread, shared by every operator waiting for the same files
+
+    def __init__(self, key, modelPath, blendshapePath, blendshapeThreshold, precision):
+        self.key = key
+        self.modelPath = modelPath
+        self.blendshapePath = blendshapePath
+        self.blendshapeThreshold = blendshapeThreshold
+        self.precision = precision
+        self.stage = "Waiting"
+        self.progress = 0.0 # Rough fraction done, eos gives no progress while parsing so each stage is one step
+        self.loadedModel = None
+        self.error = None
+        self.waiters = 0
+        self.cancelled = False
+        self.done = threading.Event()
+        self.thread = threading.Thread(target = self.run, name = "Eos model load", daemon = True)
+
+    def run(self): # Worker thread, never touches bpy, the registry takes the model on the main thread
+
+        try:
+            self.stage = "Parsing model"
+            self.progress = 0.1
+            model = loadEosModel(self.modelPath, self.blendshapePath)
+
+            if(self.cancelled): return # Nobody is waiting, the evaluator isn't worth building
+
+            self.stage = "Building evaluator"
+            self.progress = 0.7
+            self.loadedModel = LoadedModel(model, self.modelPath, self.blendshapePath, self.blendshapeThreshold, self.precision)
+
+            self.stage = "Done"
+            self.progress = 1.0
+        except Exception as error: # Handed to the operator, a bad file shouldn't kill the thread silently
+            self.error = error
+        finally:
+            self.done.set()
+
+    def isDone(self):
+        return self.done.is_set()
+
+class ModelRegistry(): # Loaded models by path and file time, least recently used models are dropped when over the memory budget
+
+    def __init__(self, memoryBudget = 2048):
+        self.models = OrderedDict()
+        self.loads = {} # Key to the ModelLoad of models loading in the background
+        self.memoryBudget = memoryBudget * 1024 * 1024
+        self.hits = 0
+        self.misses = 0
+        self.blendshapeThreshold = 0.0
+        self.precision = "FLOAT32"
+
+    def getKey(self, modelPath, blendshapePath): # Saving over a model file gives it a new key so it gets reloaded
+        return (modelPath, blendshapePath, getFileTime(modelPath), getFileTime(blendshapePath))
+
+    def get(self, modelPath, blendshapePath = ""): # The model, loaded now if needed, waits for a background load of the same files so refreshes check isLoading first
+
+        key = self.getKey(modelPath, blendshapePath)
+
+        loadedModel = self.models.get(key)
+
+        if(loadedModel != None):
+            self.hits += 1
+            self.models.move_to_end(key) # Most recently used is at the end
+            return loadedModel
+
+        load = self.loads.get(key)
+
+        if(load != None): # Already loading in the background, joined rather than parsing the files twice, its miss was counted when it started
+            load.done.wait()
+            loadedModel = self.finishLoad(load)
+            if(loadedModel != None): return loadedModel
+
+        self.misses += 1
+
+        loadedModel = LoadedModel(loadEosModel(modelPath, blendshapePath), modelPath, blendshapePath, self.blendshapeThreshold, self.precision)
+
+        self.models[key] = loadedModel
+        self.evict()
+
+        return loadedModel
+
+    def load(self, modelPath, blendshapePath = ""): # Start loading the model on a worker thread, or join the load already running for the same files, returns the ModelLoad
+
+        key = self.getKey(modelPath, blendshapePath)
+
+        load = self.loads.get(key)
+
+        if(load == None):
+            self.misses += 1
+            load = ModelLoad(key, modelPath, blendshapePath, self.blendshapeThreshold, self.precision)
+            self.loads[key] = load
+            load.thread.start()
+
+        load.waiters += 1
+
+        return load
+
+    def isLoading(self, modelPath, blendshapePath = ""): # True while the model loads in the background, so the main thread can try again later instead of waiting in get
+        load = self.loads.get(self.getKey(modelPath, blendshapePath))
+        return load != None and not load.isDone()
+
+    def release(self, load): # Stop waiting for a load, it is cancelled once nobody waits for it
+        load.waiters -= 1
+        if(load.waiters > 0 or load.isDone()): return
+        load.cancelled = True
+        if(self.loads.get(load.key) is load): del self.loads[load.key] # A new load starts from scratch
+
+    def finishLoad(self, load): # Add a finished load to the registry on the main thread, returns the loaded model, None if loading failed
+
+        if(self.loads.get(load.key) is load): del self.loads[load.key]
+
+        if(load.key in self.models): # Another waiter already added it
+            self.models.move_to_end(load.key)
+            return self.models[load.key]
+
+        loadedModel = load.loadedModel
+
+        if(loadedModel == None): return None
+
+        if(load.blendshapeThreshold != self.blendshapeThreshold): # Settings changed while it loaded
+            loadedModel.evaluator.setExpressions(loadedModel.model, self.blendshapeThreshold)
+
+        if(load.precision != self.precision):
+            loadedModel.evaluator.setPrecision(loadedModel.model, self.precision)
+
+        loadedModel.updateSize()
+
+        self.models[load.key] = loadedModel
+        self.evict()
+
+        return loadedModel
+
+    def setBudget(self, memoryBudget): # Budget in megabytes
+        self.memoryBudget = memoryBudget * 1024 * 1024
+        self.evict()
+
+    def setBlendshapeThreshold(self, threshold): # Rebuild the sparse blendshapes of loaded models if the threshold changed
+
+        if(threshold == self.blendshapeThreshold): return
+
+        self.blendshapeThreshold = threshold
+
+        for loadedModel in self.models.values():
+            loadedModel.evaluator.setExpressions(loadedModel.model, threshold)
+            loadedModel.updateSize()
+
+    def setPrecision(self, precision): # Rebuild the shape and colour bases of loaded models if the precision changed
+
+        if(precision == self.precision): return
+
+        self.precision = precision
+
+        for loadedModel in self.models.values():
+            loadedModel.evaluator.setPrecision(loadedModel.model, precision)
+            loadedModel.updateSize()
+
+        self.evict()
+
+    def find(self, modelPath, blendshapePath = ""): # The loaded model if there is one, never loads (safe in panel drawing)
+        return self.models.get(self.getKey(modelPath, blendshapePath))
+
+    def evict(self): # Drop least recently used models until under budget, the newest model is always kept
+        while(len(self.models) > 1 and self.getMemoryUsage() > self.memoryBudget):
+            self.models.popitem(last = False)
+
+    def getMemoryUsage(self):
+        return sum(loadedModel.size for loadedModel in self.models.values())
+
+    def invalidate(self, key): # Forget the kept sample buffers of an object in every model
+        for loadedModel in self.models.values():
+            loadedModel.evaluator.invalidate(key)
+
+    def getSummary(self): # Text for the panel
+        return "Models: " + str(len(self.models)) + "  " + str(round(self.getMemoryUsage() / (1024 * 1024))) + " / " + str(round(self.memoryBudget / (1024 * 1024))) + " MB  Hits: " + str(self.hits) + "  Misses: " + str(self.misses)
+
+modelRegistry = ModelRegistry() # Only one script is loaded so a object was needed
+
+class ResultCache(): # Evaluated vertices and colours by model and coefficients, so undo, redo and forced refreshes of a recent state skip evaluation
+
+    def __init__(self, memoryBudget = 256):
+        self.results = OrderedDict()
+        self.memoryBudget = memoryBudget * 1024 * 1024
+        self.memoryUsage = 0
+        self.hits = 0
+        self.misses = 0
+
+    def getKey(self, evaluator, coefficients): # Coefficients are rounded to resultStep so float noise still hits
+
+        parts = [np.asarray(part, dtype = np.float64) for part in coefficients]
+        rounded = np.rint(np.concatenate(parts) / resultStep).astype(np.int64)
+
+        return (evaluator.resultId, tuple(len(part) for part in parts), rounded.tobytes())
+
+    def get(self, key): # Vertices and colours, None if not cached
+
+        result = self.results.get(key)
+
+        if(result == None):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.results.move_to_end(key) # Most recently used is at the end
+
+        return result
+
+    def put(self, key, vertices, colours):
+
+        if(key in self.results): return
+
+        self.results[key] = (vertices, colours)
+        self.memoryUsage += vertices.nbytes + colours.nbytes
+
+        self.evict()
+
+    def setBudget(self, memoryBudget): # Budget in megabytes, 0 turns the cache off
+        self.memoryBudget = memoryBudget * 1024 * 1024
+        self.evict()
+
+    def evict(self): # Drop least recently used results until under budget
+        while(len(self.results) != 0 and self.memoryUsage > self.memoryBudget):
+            vertices, colours = self.results.popitem(last = False)[1]
+            self.memoryUsage -= vertices.nbytes + colours.nbytes
+
+    def clear(self):
+        self.results.clear()
+        self.memoryUsage = 0
+
+    def getSummary(self): # Text for the panel
+        return "Results: " + str(len(self.results)) + "  " + str(round(self.memoryUsage / (1024 * 1024), 1)) + " / " + str(round(self.memoryBudget / (1024 * 1024))) + " MB  Hits: " + str(self.hits) + "  Misses: " + str(self.misses)
+
+resultCache = ResultCache()
+
+def loadFaceModel(modelPath, blendshapePath = ""): # Get the model from the registry, loading it if needed
+    return modelRegistry.get(modelPath, blendshapePath).model
+
+def getModelPaths(obj): # Model and blendshape file of a head, a new head uses the global settings
+    if(obj.my_settings.FilePath == "" and obj.my_settings.BlendshapePath == ""):
+        return bpy.context.scene.global_setting.GlobalFilePath, bpy.context.scene.global_setting.GlobalBlendshapePath
+    return obj.my_settings.FilePath, obj.my_settings.BlendshapePath
+
+def applyModelSettings(scene): # The scene's memory budget, blendshape threshold and precision for the registry
+    modelRegistry.setBudget(scene.global_setting.ModelCacheBudget)
+    modelRegistry.setBlendshapeThreshold(scene.global_setting.BlendshapeThreshold)
+    modelRegistry.setPrecision(scene.global_setting.BasisPrecision)
+
+def getObjectModel(obj): # The head's loaded model, with the scene's memory budget, blendshape threshold and precision applied
+    applyModelSettings(bpy.context.scene)
+    return modelRegistry.get(*getModelPaths(obj))
+
+def getSliderCurves(obj): # Animation curves of the sliders, slider index to fcurve
+
+    curves = {}
+
+    if(obj.animation_data == None or obj.animation_data.action == None): return curves
+
+    for fcurve in obj.animation_data.action.fcurves:
+        if(fcurve.data_path.startswith("sliders.sliderList[") and fcurve.data_path.endswith("].value")):
+            curves[int(fcurve.data_path[len("sliders.sliderList["):-len("].value")])] = fcurve
+
+    return curves
+
+def getAnimationSignature(obj, curves): # Changes when a keyframe, an unanimated slider, the model or the topology changes, so out of date bakes are found
+
+    scene = bpy.context.scene
+
+    values = obj.sliders.getVector()
+    values = np.zeros(0, dtype = np.float32) if values is None else values.copy()
+    values[[x for x in curves if x < len(values)]] = 0 # Animated sliders change every frame, their curves are compared instead
+
+    keys = []
+
+    for x in sorted(curves):
+        points = curves[x].keyframe_points
+        for attr in ("co", "handle_left", "handle_right"):
+            buffer = np.empty(len(points) * 2, dtype = np.float64)
+            points.foreach_get(attr, buffer)
+            keys.append(buffer.tobytes())
+        keys.append(",".join([point.interpolation for point in points]) + curves[x].extrapolation)
+
+    return (modelRegistry.getKey(*getModelPaths(obj)), scene.global_setting.BasisPrecision, scene.global_setting.BlendshapeThreshold, getTopologyKey(obj), tuple(sorted(curves)), tuple(keys), values.tobytes())
+
+class AnimationBake(): # Compacted vertex positions and colours of every frame of a head's slider animation, only parts that are animated are kept per frame
+
+    def __init__(self, frameStart, frameEnd, signature, topologyKey, positions, colours, loopColours):
+        self.frameStart = frameStart
+        self.frameEnd = frameEnd
+        self.signature = signature
+        self.topologyKey = topologyKey
+        self.positions = positions # Frames (or 1 if no shape or expression slider is animated) x vertices x 3
+        self.colours = colours # Frames (or 1) x colours x 3, None for models without colour
+        self.loopColours = loopColours
+        self.writtenColour = None # Index of the colours in the colour layer
+
+    def apply(self, obj, frame): # Write the frame into the mesh, False if the frame isn't baked or the mesh was rebuilt since
+
+        mesh = obj.data
+
+        if(frame < self.frameStart or frame > self.frameEnd): return False
+        if(obj.my_settings.TopologyKey != self.topologyKey or len(mesh.vertices) != self.positions.shape[1]): return False
+
+        index = frame - self.frameStart
+
+        updateVertexPositions(mesh, self.positions[min(index, len(self.positions) - 1)])
+
+        if(self.colours is not None):
+            colourIndex = min(index, len(self.colours) - 1)
+            if(colourIndex != self.writtenColour or len(self.colours) != 1):
+                refreshColours(mesh, self.loopColours, self.colours[colourIndex])
+                self.writtenColour = colourIndex
+
+        refreshEyes(obj)
+
+        return True
+
+    def getSize(self):
+        return self.positions.nbytes + (0 if self.colours is None else self.colours.nbytes)
+
+    def getSummary(self): # Text for the panel
+        return "Baked frames " + str(self.frameStart) + " - " + str(self.frameEnd) + "  " + str(round(self.getSize() / (1024 * 1024), 1)) + " MB"
+
+bakeCache = {} # Object name to the AnimationBake of its sliders
+
+def getSliderFrames(obj, curves, frames): # Coefficients of every frame, the animated sliders from their curves and the rest from their current value, raises ValueError if the object has no sliders
+
+    vector = obj.sliders.getVector()
+
+    if(vector is None or len(obj.sliders.sliderList) == 0): raise ValueError(obj.name + " has no sliders") # Not a head, or its sliders aren't created yet
+
+    values = np.tile(vector, (len(frames), 1))
+
+    for x, fcurve in curves.items():
+        if(x < values.shape[1]): values[:, x] = [fcurve.evaluate(frame) for frame in frames]
+
+    return np.clip(values, -sliderLimit, sliderLimit)
+
+def createBakeBuffer(folder, name, shape): # Buffer for baked frames, a memory mapped .npy file if a folder is given
+    if(folder == ""): return np.empty(shape, dtype = np.float32)
+    return np.lib.format.open_memmap(os.path.join(folder, name + ".npy"), mode = "w+", dtype = np.float32, shape = shape)
+
+def bakeAnimation(obj, frameStart, frameEnd, folder = ""): # Evaluate the animated sliders over the frame range into an AnimationBake, raises ValueError if there is nothing to bake
+
+    curves = getSliderCurves(obj)
+
+    if(len(curves) == 0): raise ValueError("No slider is animated")
+
+    loadedModel = getObjectModel(obj)
+    evaluator = loadedModel.evaluator
+
+    if(obj.my_settings.UseShapeKeys and len(evaluator.expressionNames) != 0): raise ValueError("Turn off shape key expressions to bake")
+
+    topology = getCompactTopology(evaluator, getDeletionPath(obj))
+
+    frames = np.arange(frameStart, frameEnd + 1)
+    values = getSliderFrames(obj, curves, frames)
+
+    shapeCount = obj.my_settings.ShapeCount
+    colourCount = obj.my_settings.ColourCount
+
+    isShapeAnimated = any(x < shapeCount or x >= shapeCount + colourCount for x in curves)
+    isColourAnimated = any(shapeCount <= x < shapeCount + colourCount for x in curves)
+
+    name = bpy.path.clean_name(obj.name)
+
+    positions = createBakeBuffer(folder, name + "_positions", (len(frames) if isShapeAnimated else 1, topology.vertexCount, 3))
+    colours = None
+
+    if(colourCount != 0 and len(evaluator.colourMean) != 0):
+        colours = createBakeBuffer(folder, name + "_colours", (len(frames) if isColourAnimated else 1, len(evaluator.colourMean) // 3, 3))
+
+    key = "bake:" + obj.name # Own buffers so frame to frame changes are column deltas
+
+    for x in range(0, len(frames)):
+
+        coefficients = splitCoefficients(obj, values[x])
+
+        sample = evaluator.drawSample(coefficients[0], coefficients[2], coefficients[1], key)
+
+        if(x < len(positions)): positions[x] = topology.compact(sample.vertices)
+        if(colours is not None and x < len(colours)): colours[x] = sample.colors
+
+    evaluator.invalidate(key)
+
+    if(folder != ""): # Written to disk, the bake keeps reading them memory mapped
+        positions.flush()
+        if(colours is not None): colours.flush()
+
+    return AnimationBake(int(frameStart), int(frameEnd), getAnimationSignature(obj, curves), getTopologyKey(obj), positions, colours, topology.loopColours)
+
+def getValidBake(obj): # The head's bake if it still matches its animation and model, out of date bakes are dropped, only checked on frame change as it walks every keyframe
+
+    bake = bakeCache.get(obj.name)
+
+    if(bake == None): return None
+
+    if(bake.signature != getAnimationSignature(obj, getSliderCurves(obj))):
+        dropBake(obj, "its animation or model changed")
+        return None
+
+    return bake
+
+def dropBake(obj, reason): # Forget the head's bake so it is evaluated live again, says why so playback getting slower isn't a mystery
+    if(bakeCache.pop(obj.name, None) != None): print("Eos Interface: bake of " + obj.name + " dropped, " + reason + ", click Bake Animation to bake it again")
+
+def getAnimatedSliderTypes(obj, curves): # Kinds of slider the animation writes, expressions are left out if shape key drivers move them
+
+    sliderList = obj.sliders.sliderList
+    sliderTypes = set([sliderList[x].sliderType for x in curves if x < len(sliderList)])
+
+    if(obj.my_settings.UseShapeKeys): sliderTypes.discard(SliderType.Expression.value)
+
+    return sliderTypes
+
+class PointCacheWriter(): # Streams the vertex positions of each frame to a PC2 or MDD file, the frame count is known so the header is written first
+
+    def __init__(self, path, fileFormat, vertexCount, frameStart, frameCount, fps):
+
+        self.file = open(path, "wb")
+
+        if(fileFormat == "PC2"):
+            self.dtype = np.dtype("<f4")
+            self.file.write(b"POINTCACHE2\0" + struct.pack("<iiffi", 1, vertexCount, frameStart, 1.0, frameCount)) # Version, points, start frame, sample rate, samples
+        else:
+            self.dtype = np.dtype(">f4")
+            self.file.write(struct.pack(">ii", frameCount, vertexCount))
+            self.file.write((np.arange(0, frameCount) / fps).astype(self.dtype).tobytes()) # Time of each frame in seconds
+
+    def write(self, vertices):
+        self.file.write(np.ascontiguousarray(vertices, dtype = self.dtype).tobytes())
+
+    def close(self):
+        self.file.close()
+
+def writeTopology(path, vertices, topology, texcoords, loopUVs): # OBJ of the compacted mesh with its uvs, vertices in the same order as the point cache
+
+    lines = ["v %.6f %.6f %.6f" % tuple(vertex) for vertex in vertices]
+
+    if(len(texcoords) != 0):
+        if(len(loopUVs) != len(topology.loopVertices)): loopUVs = topology.loopVertexUVs # No uv faces, one uv per vertex like refreshLoopData
+        lines += ["vt %.6f %.6f" % tuple(uv) for uv in np.asarray(texcoords)]
+        corners = ["%d/%d" % corner for corner in zip(topology.loopVertices + 1, np.asarray(loopUVs) + 1)]
+    else:
+        corners = [str(vertex) for vertex in topology.loopVertices + 1]
+
+    lines += ["f " + " ".join(corners[start:start + size]) for start, size in zip(topology.loopStarts, topology.faceSizes)]
+
+    with open(path, "w") as topologyFile:
+        topologyFile.write("\n".join(lines) + "\n")
+
+def exportPointCache(obj, folder, frameStart, frameEnd, fileFormat = "PC2", fps = 24.0): # Stream the head's positions over the frame range to a point cache, with its topology once and a colour sidecar, returns the paths written, raises ValueError if the object has no sliders
+
+    if(obj.sliders.getVector() is None or len(obj.sliders.sliderList) == 0): raise ValueError(obj.name + " has no sliders") # Checked before any file is opened
+
+    loadedModel = getObjectModel(obj)
+    evaluator = loadedModel.evaluator
+
+    topology = getCompactTopology(evaluator, getDeletionPath(obj))
+    curves = getSliderCurves(obj)
+
+    shapeCount = obj.my_settings.ShapeCount
+    colourCount = obj.my_settings.ColourCount
+
+    hasColour = colourCount != 0 and len(evaluator.colourMean) == evaluator.vertexCount * 3 # One colour per vertex, so the colours line up with the cached vertices
+    isColourAnimated = any(shapeCount <= x < shapeCount + colourCount for x in curves)
+
+    name = bpy.path.clean_name(obj.name)
+    frameCount = frameEnd - frameStart + 1
+
+    paths = [os.path.join(folder, name + "." + fileFormat.lower()), os.path.join(folder, name + ".obj")]
+
+    writer = PointCacheWriter(paths[0], fileFormat, topology.vertexCount, frameStart, frameCount, fps)
+    colours = None
 
-    if(imageMat is None):
-        createImageMaterial("ImageColourMat")
+    if(hasColour): # 8 bit colours of every frame (or one if no colour slider is animated) as a memory mapped .npy
+        paths.append(os.path.join(folder, name + "_colours.npy"))
+        colours = np.lib.format.open_memmap(paths[2], mode = "w+", dtype = np.uint8, shape = (frameCount if isColourAnimated else 1, topology.vertexCount, 3))
 
-def smoothObject(mesh, shouldSmooth):
-    for f in mesh.polygons:
-        f.use_smooth = shouldSmooth          
-    return
+    key = "export:" + obj.name # Own buffers so frame to frame changes are column deltas
 
-def changedSmooth(self, context): # Called when bool (Smooth) in pannel changes
-    obj = bpy.context.object
-    mesh = obj.data
-    smoothObject(mesh, obj.my_settings.SmoothShader)
-    pass
+    try:
+        for chunkStart in range(frameStart, frameEnd + 1, pointCacheChunk): # Memory stays flat however long the range is
 
-def refreshModel(sliderObj): # Refresh the model using the slider data
+            frames = np.arange(chunkStart, min(chunkStart + pointCacheChunk, frameEnd + 1))
+            values = getSliderFrames(obj, curves, frames)
 
-    obj = bpy.context.object
+            for x in range(0, len(frames)):
 
-    scene = bpy.context.scene
+                coefficients = splitCoefficients(obj, values[x])
+                sample = evaluator.drawSample(coefficients[0], coefficients[2], coefficients[1], key)
+                vertices = topology.compact(sample.vertices)
 
-    if(obj.my_settings.IsReseting): return # Stopes code being called every slider when group reseting (Blender is not thread safe)
+                index = frames[x] - frameStart
 
-    shouldSmooth = obj.my_settings.SmoothShader
+                if(index == 0): writeTopology(paths[1], vertices, topology, sample.texcoords, topology.loopUVs if hasColour else topology.loopVertexUVs)
 
-    coofficient = getCoefficients(obj) # Grab the coefficients in list form
+                writer.write(vertices)
 
-    if not(coofficient) : return # If there are no coefficients stop
-    
-    mesh = obj.data
+                if(colours is not None and index < len(colours)):
+                    colours[index] = np.clip(np.rint(topology.compact(sample.colors) * 255), 0, 255)
+    finally:
+        writer.close()
+        evaluator.invalidate(key)
 
-    if not(aShapeKeeper.base): return # Not sure if this is ever called, it's here just in case
-    
-    filePath = obj.my_settings.FilePath
-    blendshapePath = obj.my_settings.BlendshapePath
+    if(colours is not None): colours.flush()
 
-    if(filePath == "" and blendshapePath == ""):
-        loadFaceModel(scene.global_setting.GlobalFilePath, scene.global_setting.GlobalBlendshapePath) # Load using the global settings if new model created
-    else:
+    return paths
 
-        if((filePath != aShapeKeeper.modelPath or blendshapePath != aShapeKeeper.blendShapePath) and aShapeKeeper.base != ""): #If model in shape keep object is not the same
-            
-            loadFaceModel(filePath, blendshapePath)
-            
-            if(obj.my_settings.HasEye): # Store current eyes in shape keep object
-                children = getChildren(obj)
-                if(len(children == 2)):
-                    aShapeKeeper.leftEye = children[0]
-                    aShapeKeeper.rightEye = children[1]
+@persistent
+def startFrameChange(scene, depsgraph = None): # Frame change pre handler, slider writes made by the animation don't refresh the head one slider at a time
+    global animatingFrame
+    animatingFrame = True
 
-    morphModel = aShapeKeeper.base.draw_sample(coofficient[0],coofficient[2],coofficient[1])
+@persistent
+def refreshAnimatedHeads(scene, depsgraph = None): # Frame change post handler, every animated head is refreshed once from its whole slider vector, baked heads get their buffers swapped in with no evaluation
 
-    if((sliderObj.sliderType == SliderType.Colour.value or not mesh.vertex_colors) and obj.my_settings.ColourCount != 0 and not obj.my_settings.DeleteVertex): # If only colours are changing
-        refreshColoursBM(mesh, morphModel.tci, morphModel.colors, morphModel.texcoords, morphModel.tti, shouldSmooth, False)
+    global animatingFrame
+    animatingFrame = False
 
-    else: # If any vertex positions are changing
+    for name in list(bakeCache):
+        if(bpy.data.objects.get(name) == None): del bakeCache[name] # Head was deleted
 
-        mesh.clear_geometry()
+    updateProfiler(scene)
 
-        verts = morphModel.vertices
-        edges = []
-        faces = morphModel.tvi
+    for obj in scene.objects:
 
-        mesh.from_pydata(verts, edges, faces) # Creates new mesh under the same object
-        
-        if(obj.my_settings.ColourCount == 0) :  # This is also called in refresh colours (Faster if called in refresh so redundant code is needed)
-           # smoothObject(mesh, shouldSmooth)
+        if(len(obj.sliders.sliderList) == 0): continue # Not a head
 
-            bm = bmesh.new()
-            bm.from_mesh(mesh)
+        curves = getSliderCurves(obj)
 
-            assignUV(bm,morphModel.texcoords, shouldSmooth) #Assign uv to object 
+        if(len(curves) == 0 and obj.name not in bakeCache): continue
 
-            if(obj.my_settings.DeleteVertex):
+        sliderTypes = getAnimatedSliderTypes(obj, curves)
 
-                deletionVerts = getdeletionVerts()    
+        if(obj.name in bakeCache):
+            bake = getValidBake(obj)
+            if(bake != None and bake.apply(obj, scene.frame_current)): continue
+            sliderTypes = set([x.value for x in SliderType]) # Out of date or outside the baked frames, the mesh may still hold a baked frame
 
-                if(not deletionVerts == None):
+        sliderTypes |= dirtyObjects.pop(obj.name, set()) # Changes still waiting for the timer are included
 
-                    deleteVerts(bm, deletionVerts)
+        if(len(sliderTypes) == 0): continue
 
-            bm.to_mesh(mesh)
+        if(not bpy.app.background and modelRegistry.isLoading(*getModelPaths(obj))): # Playback doesn't wait, the refresh timer draws the head once its model is ready
+            for sliderType in sliderTypes: markDirty(obj, sliderType)
+            continue
 
-        else:
-            refreshColoursBM(mesh, morphModel.tci, morphModel.colors,  morphModel.texcoords, morphModel.tti, shouldSmooth, obj.my_settings.DeleteVertex)
+        draggedObjects.discard(obj.name)
 
-    # If the model has left and right eye coordinets move and scale eyes
-    if(obj.my_settings.HasEye and aShapeKeeper.leftEye != "" and aShapeKeeper.rightEye != "" and obj.my_settings.LeftEyeVertices != "" and obj.my_settings.RightEyeVertices != ""):
+        profiler.objectName = obj.name
+        with profiler.span("refresh"):
+            refreshModel(obj, sliderTypes) # Done now rather than on a timer so background renders get the frame's head
 
-        leftVertex = obj.my_settings.LeftEyeVertices.split(",")
+prewarmLoads = [] # Model loads started when a file was opened, with the names of the heads using each
 
-        if(int(leftVertex[0]) > len(obj.data.vertices)) : return
-        if(int(leftVertex[1]) > len(obj.data.vertices)) : return
+def bindEyes(head): # Store the eyes found from the children on the head, so later refreshes don't search the objects
+    leftEye, rightEye = getEyes(head)
+    if(head.my_settings.LeftEye == None and leftEye != None): head.my_settings.LeftEye = leftEye
+    if(head.my_settings.RightEye == None and rightEye != None): head.my_settings.RightEye = rightEye
 
-        handleEye(obj, int(leftVertex[0]), int(leftVertex[1]), aShapeKeeper.leftEye, obj.my_settings.EyeScaleOffset, obj.my_settings.LeftEyePosOffset)
+@persistent
+def prewarmModels(*args): # Load post handler, the models of every head in the opened file start loading in the background so the first slider change doesn't wait for eos
 
-        rightVertex = obj.my_settings.RightEyeVertices.split(",")
+    for name in list(bakeCache) + list(dirtyObjects) + list(previewTimes) + list(refiningObjects): # Names from the previous file
+        bakeCache.pop(name, None)
+        dirtyObjects.pop(name, None)
+        previewTimes.pop(name, None)
+        refiningObjects.pop(name, None)
 
-        if(int(rightVertex[0]) > len(obj.data.vertices)) : return
-        if(int(rightVertex[1]) > len(obj.data.vertices)) : return
+    draggedObjects.clear()
 
-        handleEye(obj, int(rightVertex[0]), int(rightVertex[1]), aShapeKeeper.rightEye, obj.my_settings.EyeScaleOffset, obj.my_settings.RightEyePosOffset)
+    applyModelSettings(bpy.context.scene) # Models load with the file's precision and threshold so they don't need rebuilding
 
-        aShapeKeeper.rightEye.scale = aShapeKeeper.leftEye.scale # If the user doesn't pick mirrored vertices just use left eye for both scales
+    heads = {}
 
-        if(not obj.my_settings.DeleteVertex): # Breaks if deleted vertex comes back so the eyes are hidden
-            aShapeKeeper.leftEye.hide_set(True)
-            aShapeKeeper.rightEye.hide_set(True)
-        else:
-            aShapeKeeper.leftEye.hide_set(obj.my_settings.HideEyes)
-            aShapeKeeper.rightEye.hide_set(obj.my_settings.HideEyes)
+    for obj in bpy.data.objects:
 
-def handleEye(obj, leftVertex, rightVertex, eye, scaleOffset, posOffset): # Move and scale eye
+        if(obj.my_settings.FilePath == ""): continue # Not a head
 
-    leftVec = mathutils.Vector(obj.data.vertices[leftVertex].co)
-    rightVec = mathutils.Vector(obj.data.vertices[rightVertex].co)
+        heads.setdefault((obj.my_settings.FilePath, obj.my_settings.BlendshapePath), []).append(obj.name)
 
-    scale = abs((leftVec - rightVec).length) * scaleOffset
+        if(obj.my_settings.HasEye): bindEyes(obj)
 
-    eye.scale = (scale, scale, scale)
+    for paths, names in heads.items():
+        if(modelRegistry.find(*paths) == None): prewarmLoads.append((modelRegistry.load(*paths), names))
 
-    newpos = (leftVec + rightVec) / 2
+    if(len(prewarmLoads) != 0 and not bpy.app.timers.is_registered(finishPrewarm)):
+        bpy.app.timers.register(finishPrewarm, first_interval = 0.1)
 
-    eye.location = (newpos[0] * posOffset[0], newpos[1] * posOffset[1], newpos[2] * posOffset[2])
+def finishPrewarm(): # Timer callback, finished loads join the registry and their heads get their topology and first sample ready
 
-def resize(self, context): # if any of the shape, colour, expression sliders are changed refresh the model
-    refreshModel(self)
-    return
+    for load, names in list(prewarmLoads):
 
-def createBlenderMesh(mesh): # Create a blender mesh using eos mesh model data
+        if(not load.isDone()): continue
 
-    blendObj = bpy.data.meshes.new("Morphable Object")  # add the new mesh    
-    obj = bpy.data.objects.new(blendObj.name, blendObj)
-    col = bpy.data.collections.get("Collection")
-    col.objects.link(obj)
-    bpy.context.view_layer.objects.active = obj
+        prewarmLoads.remove((load, names))
+        modelRegistry.release(load)
 
-    verts = mesh.vertices
-    edges = []
-    faces = mesh.tvi
+        loadedModel = modelRegistry.finishLoad(load)
 
-    blendObj.from_pydata(verts, edges, faces)
+        if(loadedModel == None):
+            print("Eos Interface: couldn't load " + load.modelPath + ": " + str(load.error))
+            continue
 
-    return obj
+        evaluator = loadedModel.evaluator
 
-def loadFaceModel(modelPath, blendshapePath = ""): # Load model into shape keeper
+        for name in names:
 
-    morphablemodel_with_expressions = ""
+            obj = bpy.data.objects.get(name)
+            coefficients = None if obj == None else getCoefficients(obj)
 
-    model = eos.morphablemodel.load_model(modelPath)
+            if(coefficients == None): continue
 
-    modelType = model.get_expression_model_type()
+            if(obj.my_settings.UseShapeKeys and len(evaluator.expressionNames) != 0): coefficients[2] = [0.0] * len(coefficients[2]) # Like refreshModel, the keys add the expressions
 
-    if(modelType == model.ExpressionModelType(0) and blendshapePath != ""):
+            getCompactTopology(evaluator, getDeletionPath(obj))
+            evaluator.drawSample(coefficients[0], coefficients[2], coefficients[1], obj.name) # Later slider changes are column deltas from here
 
-        blendshapes = eos.morphablemodel.load_blendshapes(blendshapePath)
-        
-        morphablemodel_with_expressions = eos.morphablemodel.MorphableModel(model.get_shape_model(), blendshapes,
-                                                                        color_model=eos.morphablemodel.PcaModel(),
-                                                                        vertex_definitions=None,
-                                                                        texture_coordinates=model.get_texture_coordinates())
+    if(len(prewarmLoads) == 0): return None
 
-    aShapeKeeper.base = model
+    return 0.1
 
-    aShapeKeeper.modelPath = modelPath
-    aShapeKeeper.blendShapePath = blendshapePath
+def createBaseShape(FilePath, blendShapePath = "", useShapeKeys = False): # Create the base morphable model, assign sliders to model
 
-    if(morphablemodel_with_expressions != ""):
-        aShapeKeeper.base = morphablemodel_with_expressions
-    else:
-       return model
+    updateProfiler(bpy.context.scene)
+    profiler.objectName = "" # Named once the object exists
 
-    return morphablemodel_with_expressions
+    with profiler.span("create"):
+        return createBaseShapeStages(FilePath, blendShapePath, useShapeKeys)
 
-def createBaseShape(FilePath, blendShapePath = ""): # Create the base morphable model, assign sliders to model
+def createBaseShapeStages(FilePath, blendShapePath, useShapeKeys): # createBaseShape with each stage timed
     
-    base = loadFaceModel(FilePath, blendShapePath)
+    with profiler.span("create: load model"):
+        loadedModel = modelRegistry.get(FilePath, blendShapePath)
+
+    base = loadedModel.model
 
-    secondMesh = base.draw_sample([0,0,0],[0,0,0]) # Draw the basic model
+    with profiler.span("create: draw sample"):
+        secondMesh = base.draw_sample([0,0,0],[0,0,0]) # Draw the basic model
 
-    obj = createBlenderMesh(secondMesh)
+    with profiler.span("create: mesh"):
+        obj = createBlenderMesh(secondMesh.vertices, getCompactTopology(loadedModel.evaluator, None))
+
+    profiler.objectName = obj.name
 
     modelType = base.get_expression_model_type()
 
@@ -536,17 +2484,14 @@ def createBaseShape(FilePath, blendShapePath = ""): # Create the base morphable
         obj.my_settings.ShapeCount = 0
         obj.my_settings.ColourCount = 0
 
-        if(secondMesh.texcoords != []): # If there are no UV don't try to add them, if none texcoords return an empty list []
-            mesh = obj.data
-
-            bm = bmesh.new() # No mesh changes so get set uv here
-            bm.from_mesh(mesh)
-            assignUV(bm, secondMesh.texcoords, False)        
-            bm.to_mesh(mesh)
+        if(len(secondMesh.texcoords) != 0): # If there are no UV don't try to add them, if none texcoords return an empty list []
+            with profiler.span("create: uvs"):
+                refreshLoopData(obj.data, getCompactTopology(loadedModel.evaluator, None), loadedModel.evaluator.drawSample([], [], []), False, False) # No mesh changes so get set uv here
 
 
     elif(modelType == base.ExpressionModelType.Blendshapes): # If blenshape model type
         obj.my_settings.ExpressionCount = len(base.get_expression_model())
+        obj.my_settings.UseShapeKeys = useShapeKeys # Only blendshapes can be shape keys
         obj.my_settings.ShapeCount = base.get_shape_model().get_num_principal_components()
         obj.my_settings.ColourCount = base.get_color_model().get_num_principal_components()
 
@@ -562,7 +2507,14 @@ def createBaseShape(FilePath, blendShapePath = ""): # Create the base morphable
     if not obj.get('_RNA_UI'): # Not sure but it's needed otherwise you can't add dynamic properties to model
         obj['_RNA_UI'] = {}
 
-    for x in range(0,obj.my_settings.ShapeCount + obj.my_settings.ColourCount + obj.my_settings.ExpressionCount): # Create sliders (SliderProp List) and assign slider types to each
+    with profiler.span("create: sliders"):
+        createSliders(obj)
+
+    return base
+
+def createSliders(obj): # Create sliders (SliderProp List) and assign slider types to each
+
+    for x in range(0,obj.my_settings.ShapeCount + obj.my_settings.ColourCount + obj.my_settings.ExpressionCount):
         prop = obj.sliders.sliderList.add()
         prop.value = 0
 
@@ -576,8 +2528,6 @@ def createBaseShape(FilePath, blendShapePath = ""): # Create the base morphable
 
         prop.sliderType = SliderType.Expression.value
 
-    return base
-
 def getLabelText(showMore, sliderCount): # Formats the correct label for hiding and showing slider
 
     if(sliderCount < maxSlider): return ""
@@ -588,13 +2538,38 @@ def getLabelText(showMore, sliderCount): # Formats the correct label for hiding
 
 def dirtyRefresh(self, context): # If the data is dirty (Changed without update) refresh the model
     obj = bpy.context.object
-    obj.sliders.sliderList[0].value = obj.sliders.sliderList[0].value
+
+    modelRegistry.invalidate(obj.name) # Full recompute
+
+    markDirty(obj)
+
+def changedCacheBudget(self, context): # Unload models straight away if the budget is lowered
+    modelRegistry.setBudget(context.scene.global_setting.ModelCacheBudget)
+
+def changedResultBudget(self, context): # Drop results straight away if the budget is lowered
+    resultCache.setBudget(context.scene.global_setting.ResultCacheBudget)
+
+def changedBlendshapeThreshold(self, context): # Rebuild the sparse blendshapes and refresh the heads using them
+    modelRegistry.setBlendshapeThreshold(context.scene.global_setting.BlendshapeThreshold)
+
+    for obj in bpy.data.objects:
+        if(getattr(obj, "type", "") == "MESH" and obj.my_settings.ExpressionCount != 0): markDirty(obj)
+
+def changedBasisPrecision(self, context): # Rebuild the shape and colour bases and refresh every head
+    modelRegistry.setPrecision(context.scene.global_setting.BasisPrecision)
+
+    for obj in bpy.data.objects:
+        if(getattr(obj, "type", "") == "MESH" and obj.my_settings.ShapeCount + obj.my_settings.ColourCount != 0): markDirty(obj)
 
 def changedHideEyes(self, context): # If bool hide eyes had changed
     obj = context.object
+
+    leftEye, rightEye = getEyes(obj)
+
+    if(leftEye == None or rightEye == None): return
     
-    aShapeKeeper.leftEye.hide_set(obj.my_settings.HideEyes)
-    aShapeKeeper.rightEye.hide_set(obj.my_settings.HideEyes)
+    leftEye.hide_set(obj.my_settings.HideEyes)
+    rightEye.hide_set(obj.my_settings.HideEyes)
 
 def getEyeModel(filepath, objName, link): # Load and create the eye model
 
@@ -618,7 +2593,8 @@ class MySettings(bpy.types.PropertyGroup): # All the data stored on every create
     ExpressionShowMore : bpy.props.BoolProperty(name = "ExpressionShowMore", description = "Should I show more", default = False)
 
     SmoothShader : bpy.props.BoolProperty(name = "Smooth Shading", description  = "Should I smooth shade", default = False, update = changedSmooth)
-    IsReseting : bpy.props.BoolProperty(name = "Reseting Slidser", default = False)
+    UseShapeKeys : bpy.props.BoolProperty(name = "Shape Key Expressions", description = "Expressions are baked shape keys driven by the sliders", default = False)
+    TopologyKey : bpy.props.StringProperty(name = "TopologyKey", description = "What the current mesh topology was built from", default = "")
 
     FilePath : bpy.props.StringProperty(name = "File Path:", subtype = "FILE_PATH")
     BlendshapePath : bpy.props.StringProperty(name = "Blendshape Path:", subtype = "FILE_PATH")
@@ -635,6 +2611,8 @@ class MySettings(bpy.types.PropertyGroup): # All the data stored on every create
     ExpreSD : bpy.props.FloatProperty(name = "Expre SD",min = 0, max = 2, description = "Standard Deviation for Expressions", default = 0)
 
     HasEye : bpy.props.BoolProperty(name = "Has Eye", default = False)
+    LeftEye : bpy.props.PointerProperty(name = "Left Eye", type = bpy.types.Object)
+    RightEye : bpy.props.PointerProperty(name = "Right Eye", type = bpy.types.Object)
     LeftEyeVertices : bpy.props.StringProperty(name = "Vertex",default = "")
     RightEyeVertices : bpy.props.StringProperty(name = "Vertex",default = "")
 
@@ -650,16 +2628,143 @@ class GlobalSettings(bpy.types.PropertyGroup): # All the data stored in the scen
     GlobalBlendshapePath : bpy.props.StringProperty(name = "Blendshape Path:", subtype = "FILE_PATH")
     GlobalVertexStore : bpy.props.StringProperty(subtype = "FILE_PATH")
     GlobalEyePath : bpy.props.StringProperty(subtype = "FILE_PATH")
+    UseShapeKeys : bpy.props.BoolProperty(name = "Expressions As Shape Keys", description = "Bake blendshape expressions into shape keys driven by the sliders (blendshape models only)", default = False)
+    RefreshRate : bpy.props.FloatProperty(name = "Refresh Rate", description = "Most model refreshes per second while sliders change", min = 1, max = 240, default = 60)
+    DragPreview : bpy.props.BoolProperty(name = "Preview While Dragging", description = "Draw a coarse copy of the head while sliders are dragged, full resolution comes back when they stop", default = False)
+    PreviewRatio : bpy.props.FloatProperty(name = "Preview Detail", description = "Fraction of the vertices kept in the drag preview", min = 0.01, max = 0.9, default = 0.25)
+    ProgressiveEvaluation : bpy.props.BoolProperty(name = "Progressive Evaluation", description = "While dragging only evaluate the largest shape and colour components that fit the target frame time, the rest are added when idle", default = False)
+    TargetFrameTime : bpy.props.FloatProperty(name = "Target Frame Time (ms)", description = "Refresh time progressive evaluation picks its number of components for", min = 1, max = 1000, default = 16)
+    PreviewIdle : bpy.props.FloatProperty(name = "Preview Idle (s)", description = "Seconds without slider changes before the head is drawn at full resolution again", min = 0.05, max = 5, default = 0.3)
+    ResultCacheBudget : bpy.props.IntProperty(name = "Result Memory (MB)", description = "Memory kept for recently evaluated heads so returning to them (undo, redo, forced refreshes) skips evaluation, 0 turns it off", min = 0, default = 256, update = changedResultBudget)
+    ModelCacheBudget : bpy.props.IntProperty(name = "Model Memory (MB)", description = "Memory the loaded models can use before the least recently used is unloaded", min = 64, default = 2048, update = changedCacheBudget)
+    BlendshapeThreshold : bpy.props.FloatProperty(name = "Blendshape Threshold", description = "Blendshape offsets this small or smaller are treated as zero and not stored", min = 0, default = 0, precision = 6, update = changedBlendshapeThreshold)
+    BasisPrecision : bpy.props.EnumProperty(name = "Basis Precision", description = "How the shape and colour bases are stored, lower precision uses less memory", items = basisPrecisions, default = "FLOAT32", update = changedBasisPrecision)
+    CheckEvaluator : bpy.props.BoolProperty(name = "Check Evaluator", description = "Compare every refresh against eos draw_sample (slow, for debugging)", default = False)
+    EnableTiming : bpy.props.BoolProperty(name = "Time Refreshes", description = "Time each stage of model refreshes and creation", default = False)
+    TimingStreamPath : bpy.props.StringProperty(name = "Timing File", description = "JSON lines file every stage timing is appended to (empty to only show the summary)", subtype = "FILE_PATH")
+    BakeFolder : bpy.props.StringProperty(name = "Bake Folder", description = "Folder baked animation is written to and memory mapped from (empty to keep it in memory)", subtype = "DIR_PATH")
+    PointCacheFolder : bpy.props.StringProperty(name = "Point Cache Folder", description = "Folder the point cache, topology and colours are exported to", subtype = "DIR_PATH")
+    PointCacheFormat : bpy.props.EnumProperty(name = "Point Cache Format", description = "File format of the exported vertex positions", items = pointCacheFormats, default = "PC2")
+    ShowTiming : bpy.props.BoolProperty(name = "Timings", description = "Show the refresh stage timings", default = False)
 
 class SliderProp(bpy.types.PropertyGroup): # The data in a slider property
 
-    value : bpy.props.FloatProperty(name = "Length",min = -3, max = 3, description = "DataLength", default = 0, update = resize, options = {'ANIMATABLE'})
+    value : bpy.props.FloatProperty(name = "Length",min = -sliderLimit, max = sliderLimit, description = "DataLength", default = 0, update = resize, options = {'ANIMATABLE'})
     sliderType : bpy.props.IntProperty(name = "SliderType", description = "Int enum value for the slider type", default = 0)
 
-class SliderList(bpy.types.PropertyGroup): # The list of sliders
+class SliderList(bpy.types.PropertyGroup): # The list of sliders, also the API scripts use to read and write every coefficient at once
     sliderList : bpy.props.CollectionProperty(type=SliderProp)
 
-class Create_New_Model(bpy.types.Operator): # Create model button
+    def getCount(self): # Number of sliders the head's model uses
+        settings = self.id_data.my_settings
+        return settings.ShapeCount + settings.ColourCount + settings.ExpressionCount
+
+    def getVector(self): # All coefficients (shape, colour then expression) as one float32 array, None if the sliders haven't been created yet
+
+        count = self.getCount()
+
+        if(len(self.sliderList) < count): return None
+
+        values = np.empty(len(self.sliderList), dtype = np.float32)
+        self.sliderList.foreach_get("value", values)
+
+        return values[:count]
+
+    def setVector(self, values, refreshNow = False): # Write every coefficient at once, the head is refreshed once (straight away if refreshNow)
+
+        obj = self.id_data
+        count = self.getCount()
+
+        if(len(self.sliderList) < count): return
+
+        values = np.clip(np.asarray(values, dtype = np.float32).reshape(-1), -sliderLimit, sliderLimit) # Same range as the sliders
+
+        if(len(values) != count): raise ValueError("Expected " + str(count) + " coefficients, got " + str(len(values)))
+
+        allValues = np.empty(len(self.sliderList), dtype = np.float32)
+        self.sliderList.foreach_get("value", allValues)
+
+        old = allValues[:count].copy()
+        allValues[:count] = values
+
+        self.sliderList.foreach_set("value", allValues) # Bulk writes skip the update callbacks, the changed parts are marked below
+
+        changedTypes = [sliderType.value for sliderType, oldPart, newPart in zip(SliderType, splitCoefficients(obj, old), splitCoefficients(obj, values)) if not np.array_equal(oldPart, newPart)]
+
+        for sliderType in changedTypes:
+
+            if(sliderType == SliderType.Expression.value and obj.my_settings.UseShapeKeys):
+                obj.update_tag() # Drivers move the shape keys, they only need the depsgraph to update
+                continue
+
+            markDirty(obj, sliderType)
+
+        if(refreshNow): flushRefreshes()
+
+    def setParts(self, shape = None, colour = None, expression = None, refreshNow = False): # Write any of the shape, colour or expression coefficients, the rest are kept
+
+        values = self.getVector()
+
+        if(values is None): return
+
+        shapePart, colourPart, expressionPart = splitCoefficients(self.id_data, values) # Views into values
+
+        for part, newPart in ((shapePart, shape), (colourPart, colour), (expressionPart, expression)):
+            if(newPart is not None): part[:] = newPart
+
+        self.setVector(values, refreshNow)
+
+class ModelLoadModal(): # Operators creating heads wait for the model on a worker thread so Blender stays usable, Esc cancels
+
+    def startLoad(self, context, modelPath, blendshapePath): # Create the head straight away if the model is loaded (or in background mode), otherwise wait modally
+
+        applyModelSettings(context.scene) # The worker builds the evaluator with the scene's precision and threshold
+
+        if(bpy.app.background or modelRegistry.find(modelPath, blendshapePath) != None):
+            return self.createHead(context)
+
+        self.load = modelRegistry.load(modelPath, blendshapePath)
+
+        windowManager = context.window_manager
+        self.timer = windowManager.event_timer_add(0.1, window = context.window)
+        windowManager.modal_handler_add(self)
+        windowManager.progress_begin(0, 100)
+
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+
+        load = self.load
+
+        if(event.type == 'ESC'):
+            self.endLoad(context)
+            modelRegistry.release(load)
+            self.report({"INFO"}, "Model loading cancelled")
+            return {'CANCELLED'}
+
+        if(event.type != 'TIMER'): return {'PASS_THROUGH'}
+
+        if(not load.isDone()):
+            context.window_manager.progress_update(int(load.progress * 100))
+            context.workspace.status_text_set("Loading " + os.path.basename(load.modelPath) + ": " + load.stage + " (Esc to cancel)")
+            return {'PASS_THROUGH'}
+
+        self.endLoad(context)
+        modelRegistry.release(load)
+
+        if(modelRegistry.finishLoad(load) == None):
+            self.report({"ERROR"}, "Couldn't load the model: " + str(load.error))
+            return {'CANCELLED'}
+
+        return self.createHead(context) # The model is in the registry, creating the head doesn't load it again
+
+    def endLoad(self, context): # Remove the timer, progress and status text
+        windowManager = context.window_manager
+        windowManager.event_timer_remove(self.timer)
+        windowManager.progress_end()
+        context.workspace.status_text_set(None)
+
+class Create_New_Model(ModelLoadModal, bpy.types.Operator): # Create model button
     bl_idname = "view3d.create_new_model"
     bl_label = "Create New Model"
     bl_destription = "A button to create a new morphable face"
@@ -680,19 +2785,69 @@ class Create_New_Model(bpy.types.Operator): # Create model button
             scene.global_setting.GlobalBlendshapePath = ""
             return {'FINISHED'}
 
+        self.filePath = scene.global_setting.GlobalFilePath
+        self.blendshapePath = blendshapePath
+        self.useShapeKeys = scene.global_setting.UseShapeKeys
+
+        return self.startLoad(context, self.filePath, blendshapePath)
 
-        createBaseShape(scene.global_setting.GlobalFilePath, blendshapePath)
+    def createHead(self, context): # Called once the model is loaded
+
+        createBaseShape(self.filePath, self.blendshapePath, self.useShapeKeys)
         obj = context.object
 
-        obj.my_settings.FilePath = scene.global_setting.GlobalFilePath # Add un-editable to pannel for user debugging 
-        obj.my_settings.FileName = (scene.global_setting.GlobalFilePath.split("\\")[-1])[:-4]
+        obj.my_settings.FilePath = self.filePath # Add un-editable to pannel for user debugging 
+        obj.my_settings.FileName = (self.filePath.split("\\")[-1])[:-4]
 
-        obj.my_settings.BlendshapePath = blendshapePath
+        obj.my_settings.BlendshapePath = self.blendshapePath
 
         obj.scale = (0.01, 0.01, 0.01) # Blender's default metric is meters, 3DMM is centimeters
 
         return {'FINISHED'}
 
+class Check_Precision(bpy.types.Operator): # Check precision button
+    bl_idname = "view3d.check_precision"
+    bl_label = "Check Precision"
+    bl_destription = "A button to compare every basis precision against full precision eos samples"
+
+    def execute(self, context):
+
+        scene = context.scene
+
+        if(scene.global_setting.GlobalFilePath == ""):
+            self.report({"ERROR"}, "No model path")
+            return {'FINISHED'}
+
+        loadedModel = modelRegistry.get(scene.global_setting.GlobalFilePath, scene.global_setting.GlobalBlendshapePath)
+        loadedModel.precisionReport = getPrecisionReport(loadedModel)
+
+        for line in loadedModel.precisionReport: print("Eos Interface: " + line)
+
+        return {'FINISHED'}
+
+class Convert_Model_Cache(bpy.types.Operator): # Build model cache button
+    bl_idname = "view3d.convert_model_cache"
+    bl_label = "Build Model Cache"
+    bl_destription = "A button to write the model as memory mapped files so it loads near instantly"
+
+    def execute(self, context):
+
+        scene = context.scene
+
+        if(scene.global_setting.GlobalFilePath[-3:] != "bin") : # If file is not compatible 
+            self.report({"ERROR"}, "File not compatible")
+            return {'FINISHED'}
+
+        try:
+            folder = convertModelCache(scene.global_setting.GlobalFilePath, scene.global_setting.GlobalBlendshapePath)
+        except OSError as error: # Read only folder or a full disk
+            self.report({"ERROR"}, "Couldn't write the model cache: " + str(error))
+            return {'FINISHED'}
+
+        self.report({"INFO"}, "Model cache written to " + folder)
+
+        return {'FINISHED'}
+
 class Save_Selected_Vertex(bpy.types.Operator): # Save selected vertices button
     bl_idname = "view3d.save_selected_vertex"
     bl_label = "Save Selected Vertices"
@@ -753,11 +2908,11 @@ class Save_Selected_Vertex(bpy.types.Operator): # Save selected vertices button
 
         f.close()
 
-        obj.sliders.sliderList[0].value = obj.sliders.sliderList[0].value # Refresh model
+        markDirty(obj) # Refresh model
         
         return {'FINISHED'}
 
-class Create_Copy_Model(bpy.types.Operator): # Create a copy of selected model button
+class Create_Copy_Model(ModelLoadModal, bpy.types.Operator): # Create a copy of selected model button
     bl_idname = "view3d.create_copy_model"
     bl_label = "Create Copy Model"
     bl_destription = "A button to create a new morphable face"
@@ -766,17 +2921,22 @@ class Create_Copy_Model(bpy.types.Operator): # Create a copy of selected model b
 
         obj = context.object
 
-        filePath = obj.my_settings.FilePath
-        blendshapePath = obj.my_settings.BlendshapePath
+        self.filePath = obj.my_settings.FilePath
+        self.blendshapePath = obj.my_settings.BlendshapePath
+        self.useShapeKeys = obj.my_settings.UseShapeKeys
 
-        createBaseShape(filePath, blendshapePath)
+        return self.startLoad(context, self.filePath, self.blendshapePath)
+
+    def createHead(self, context): # Called once the model is loaded
+
+        createBaseShape(self.filePath, self.blendshapePath, self.useShapeKeys)
 
         obj = context.object #Grab the new object
 
-        obj.my_settings.FilePath = filePath
-        obj.my_settings.FileName = (filePath.split("\\")[-1])[:-4]
+        obj.my_settings.FilePath = self.filePath
+        obj.my_settings.FileName = (self.filePath.split("\\")[-1])[:-4]
 
-        obj.my_settings.BlendshapePath = blendshapePath
+        obj.my_settings.BlendshapePath = self.blendshapePath
         obj.scale = (0.01, 0.01, 0.01) # Blender's default metric is meters, 3DMM is centimeters
         
 
@@ -817,8 +2977,8 @@ class Link_Eye_Model(bpy.types.Operator): # Link eyes button
 
         head.my_settings.HasEye = True
 
-        aShapeKeeper.leftEye = leftEye
-        aShapeKeeper.rightEye = rightEye
+        head.my_settings.LeftEye = leftEye # Each head keeps its own eyes
+        head.my_settings.RightEye = rightEye
 
         return {'FINISHED'}
 
@@ -854,8 +3014,8 @@ class Link_LEye_Vertex(bpy.types.Operator): # Link left eye vetices button
 
         head.my_settings.LeftEyeVertices = str(selectedVerts[0].index) + "," + str(selectedVerts[1].index) # Blender doens't store lists so keep it as a string 
 
-        if(aShapeKeeper.leftEye != "" and aShapeKeeper.rightEye != ""): # Only refresh if both left and right eye have been set
-            head.sliders.sliderList[0].value = head.sliders.sliderList[0].value
+        if(not None in getEyes(head)): # Only refresh if both left and right eye have been set
+            markDirty(head)
 
         return {'FINISHED'}
 
@@ -891,8 +3051,8 @@ class Link_REye_Vertex(bpy.types.Operator):# Link right eye vetices button
 
         head.my_settings.RightEyeVertices = str(selectedVerts[0].index) + "," + str(selectedVerts[1].index) # Blender doens't store lists so keep it as a string
 
-        if(aShapeKeeper.leftEye != "" and aShapeKeeper.rightEye != ""): # Only refresh if both left and right eye have been set
-            head.sliders.sliderList[0].value = head.sliders.sliderList[0].value
+        if(not None in getEyes(head)): # Only refresh if both left and right eye have been set
+            markDirty(head)
 
         return {'FINISHED'}
 
@@ -943,15 +3103,8 @@ class Reset_Sliders(bpy.types.Operator): # Resets all sliders to zero
     def execute(self, context):
 
         obj = context.object
-        obj.my_settings.IsReseting = True # Stop the update being called during change
-
-        for x in range(0, obj.my_settings.ShapeCount + obj.my_settings.ExpressionCount + obj.my_settings.ColourCount): 
-
-            obj.sliders.sliderList[x].value = 0.0
 
-        obj.my_settings.IsReseting = False
-
-        obj.sliders.sliderList[0].value = 0.0 #Trigger the refresh
+        obj.sliders.setVector(np.zeros(obj.sliders.getCount(), dtype = np.float32)) # One bulk write, refreshed once
 
         return {'FINISHED'}
 
@@ -963,33 +3116,96 @@ class Random_Sliders(bpy.types.Operator): # Randomise the sliders
     def execute(self, context):
 
         obj = context.object
-        obj.my_settings.IsReseting = True # Stop the update being called during change
-        
 
         ############################ Normal (Gaussian) Random ##################################################
 
-        normalListShape = random.normal(loc = 0, scale = obj.my_settings.ShapeSD, size = obj.my_settings.ShapeCount) # Create gaussian random lists using values inputed by user
-        normalListColour = random.normal(loc = 0, scale = obj.my_settings.ColourSD, size = obj.my_settings.ColourCount)
-        normalListExp = random.normal(loc = 0, scale = obj.my_settings.ExpreSD, size = obj.my_settings.ExpressionCount)
+        counts = (obj.my_settings.ShapeCount, obj.my_settings.ColourCount, obj.my_settings.ExpressionCount)
+        deviations = (obj.my_settings.ShapeSD, obj.my_settings.ColourSD, obj.my_settings.ExpreSD) # Standard deviations inputed by user
 
-        for x in range(0, obj.my_settings.ShapeCount + obj.my_settings.ExpressionCount + obj.my_settings.ColourCount):             
+        obj.sliders.setVector(getRandomCoefficients(counts, deviations)) # Same order as the slider list, refreshed once
 
-            if x < obj.my_settings.ShapeCount:
-                
-                obj.sliders.sliderList[x].value = normalListShape[x]
+        ##########################################################################################################
 
-            elif x < obj.my_settings.ShapeCount + obj.my_settings.ColourCount:
-                obj.sliders.sliderList[x].value = normalListColour[x - obj.my_settings.ShapeCount]
+        return {'FINISHED'}
 
-            else:
-                obj.sliders.sliderList[x].value = normalListExp[x - obj.my_settings.ShapeCount - obj.my_settings.ColourCount]
+class Reset_Timings(bpy.types.Operator): # Clear the refresh stage timings
+    bl_idname = "view3d.reset_timings"
+    bl_label = "Reset Timings"
+    bl_destription = "A button to clear the refresh stage timings"
 
+    def execute(self, context):
 
-        ##########################################################################################################
+        profiler.reset()
+
+        return {'FINISHED'}
+
+class Bake_Animation(bpy.types.Operator): # Bake animated sliders button
+    bl_idname = "view3d.bake_animation"
+    bl_label = "Bake Animation"
+    bl_destription = "A button to evaluate the animated sliders over the scene frame range so playback only swaps buffers"
+
+    def execute(self, context):
+
+        obj = context.object
+        scene = context.scene
+
+        folder = bpy.path.abspath(scene.global_setting.BakeFolder)
+
+        if(folder != "" and not os.path.isdir(folder)):
+            self.report({"ERROR"}, "Bake folder doesn't exist")
+            return {'FINISHED'}
+
+        bakeCache.pop(obj.name, None) # Old memory mapped files are closed before being written again
+
+        try:
+            bakeCache[obj.name] = bakeAnimation(obj, scene.frame_start, scene.frame_end, folder)
+        except ValueError as error:
+            self.report({"ERROR"}, str(error))
+            return {'FINISHED'}
+
+        if(not bakeCache[obj.name].apply(obj, scene.frame_current)): markDirty(obj) # Current frame is outside the scene range
+
+        self.report({"INFO"}, bakeCache[obj.name].getSummary())
+
+        return {'FINISHED'}
+
+class Clear_Bake(bpy.types.Operator): # Clear baked animation button
+    bl_idname = "view3d.clear_bake"
+    bl_label = "Clear Bake"
+    bl_destription = "A button to drop the baked animation, playback evaluates the sliders again"
+
+    def execute(self, context):
+
+        obj = context.object
+
+        bakeCache.pop(obj.name, None)
+        markDirty(obj)
+
+        return {'FINISHED'}
+
+class Export_Point_Cache(bpy.types.Operator): # Export point cache button
+    bl_idname = "view3d.export_point_cache"
+    bl_label = "Export Point Cache"
+    bl_destription = "A button to write the head's positions over the scene frame range to a point cache, with its topology and colours, so it renders without eos"
+
+    def execute(self, context):
+
+        obj = context.object
+        scene = context.scene
 
-        obj.my_settings.IsReseting = False
+        folder = bpy.path.abspath(scene.global_setting.PointCacheFolder)
+
+        if(not os.path.isdir(folder)):
+            self.report({"ERROR"}, "Point cache folder doesn't exist")
+            return {'FINISHED'}
+
+        try:
+            paths = exportPointCache(obj, folder, scene.frame_start, scene.frame_end, scene.global_setting.PointCacheFormat, scene.render.fps / scene.render.fps_base)
+        except ValueError as error:
+            self.report({"ERROR"}, str(error))
+            return {'FINISHED'}
 
-        obj.sliders.sliderList[0].value = obj.sliders.sliderList[0].value #Trigger the refresh
+        self.report({"INFO"}, "Exported " + ", ".join(os.path.basename(path) for path in paths))
 
         return {'FINISHED'}
 
@@ -1024,6 +3240,84 @@ class Main_PT_Panel(bpy.types.Panel): # The main pannel
         row.prop(scene.global_setting, "GlobalBlendshapePath", text = "Blendshape Path")
         row.enabled = isInObjectMode        
 
+        row = box.row()
+        row.operator('view3d.convert_model_cache')
+        row.enabled = isInObjectMode
+
+        row = box.row()
+        row.prop(scene.global_setting, "UseShapeKeys")
+        row.enabled = isInObjectMode
+
+        row = box.row()
+        row.prop(scene.global_setting, "RefreshRate")
+
+        row = box.row()
+        row.prop(scene.global_setting, "DragPreview")
+
+        if(scene.global_setting.DragPreview):
+            row = box.row()
+            row.prop(scene.global_setting, "PreviewRatio")
+            row.prop(scene.global_setting, "PreviewIdle")
+
+        row = box.row()
+        row.prop(scene.global_setting, "ProgressiveEvaluation")
+
+        if(scene.global_setting.ProgressiveEvaluation):
+            row.prop(scene.global_setting, "TargetFrameTime")
+
+        row = box.row()
+        row.prop(scene.global_setting, "ModelCacheBudget")
+
+        row = box.row()
+        row.label(text = modelRegistry.getSummary())
+
+        row = box.row()
+        row.prop(scene.global_setting, "ResultCacheBudget")
+
+        row = box.row()
+        row.label(text = resultCache.getSummary())
+
+        row = box.row()
+        row.prop(scene.global_setting, "BlendshapeThreshold")
+
+        row = box.row()
+        row.prop(scene.global_setting, "BasisPrecision")
+        row.operator('view3d.check_precision')
+
+        loadedModel = modelRegistry.find(scene.global_setting.GlobalFilePath, scene.global_setting.GlobalBlendshapePath)
+
+        if(loadedModel != None): # Result of the last precision check
+            for line in loadedModel.precisionReport:
+                row = box.row()
+                row.label(text = line)
+
+        row = box.row()
+        row.prop(scene.global_setting, "CheckEvaluator")
+
+        row = box.row()
+        row.prop(scene.global_setting, "ShowTiming", icon = "TRIA_DOWN" if scene.global_setting.ShowTiming else "TRIA_RIGHT", emboss = False)
+
+        if(scene.global_setting.ShowTiming): # Collapsible timing section
+
+            row = box.row()
+            row.prop(scene.global_setting, "EnableTiming")
+            row.operator('view3d.reset_timings')
+
+            row = box.row()
+            row.prop(scene.global_setting, "TimingStreamPath")
+
+            for name, last, mean, p95 in profiler.getSummary():
+                row = box.row()
+                row.label(text = name)
+                row.label(text = "Last " + str(round(last, 2)) + "  Mean " + str(round(mean, 2)) + "  P95 " + str(round(p95, 2)) + " ms")
+
+            loadedModel = None if getattr(obj, "type", "") != "MESH" else modelRegistry.find(obj.my_settings.FilePath, obj.my_settings.BlendshapePath)
+
+            if(scene.global_setting.ProgressiveEvaluation and loadedModel != None and loadedModel.evaluator.componentBudget.limit != None):
+                row = box.row()
+                row.label(text = "Drag components")
+                row.label(text = str(loadedModel.evaluator.componentBudget.limit) + " per basis")
+
         if(obj != None):
 
             objType = getattr(obj, "type", "")
@@ -1064,6 +3358,12 @@ class Main_PT_Panel(bpy.types.Panel): # The main pannel
                     row.prop(obj.my_settings, "BlendshapePath")
                     row.enabled = False
 
+                    loadedModel = modelRegistry.find(obj.my_settings.FilePath, obj.my_settings.BlendshapePath)
+
+                    if(loadedModel != None and loadedModel.evaluator.getExpressionSummary() != ""): # Sparse blendshape density and memory
+                        row = box.row()
+                        row.label(text = loadedModel.evaluator.getExpressionSummary())
+
                     box = layout.box()  
 
                     row = box.row()
@@ -1095,7 +3395,7 @@ class Main_PT_Panel(bpy.types.Panel): # The main pannel
                     row.prop(scene.global_setting, "GlobalEyePath", text = "Eye Path")
                     row.enabled = isInObjectMode 
 
-                    if(aShapeKeeper.leftEye != "" and aShapeKeeper.rightEye != ""): # Only show if both eyes exist
+                    if(not None in getEyes(obj)): # Only show if both eyes exist
                         row = box.row()
                         row.prop(obj.my_settings, "HideEyes", text = "Hide Eyes")
                         row.enabled = isInObjectMode 
@@ -1158,6 +3458,31 @@ class Main_PT_Panel(bpy.types.Panel): # The main pannel
                     row.operator('view3d.reset_sliders')
                     row.enabled = isInObjectMode   
 
+                    box = layout.box()
+
+                    row = box.row()
+                    row.operator('view3d.bake_animation')
+                    row.operator('view3d.clear_bake')
+                    row.enabled = isInObjectMode
+
+                    row = box.row()
+                    row.prop(scene.global_setting, "BakeFolder")
+
+                    if(obj.name in bakeCache): # Checking the bake is up to date is left to the frame change handler
+                        row = box.row()
+                        row.label(text = bakeCache[obj.name].getSummary())
+
+                    box = layout.box()
+
+                    row = box.row()
+                    row.operator('view3d.export_point_cache')
+                    row.enabled = isInObjectMode
+
+                    row = box.row()
+                    row.prop(scene.global_setting, "PointCacheFolder")
+                    row = box.row()
+                    row.prop(scene.global_setting, "PointCacheFormat")
+
                 if(shapeCount > 0): # Handle Shape Sliders
                     box = layout.box() 
                     row = box.row()
@@ -1244,6 +3569,8 @@ classes = (
     Main_PT_Panel,
     Create_New_Model,
     Create_Copy_Model,
+    Convert_Model_Cache,
+    Check_Precision,
     MySettings,
     SliderProp,
     SliderList,
@@ -1252,6 +3579,10 @@ classes = (
     Show_More_Expression,
     Reset_Sliders,
     Random_Sliders,
+    Reset_Timings,
+    Bake_Animation,
+    Clear_Bake,
+    Export_Point_Cache,
     GlobalSettings,
     Save_Selected_Vertex,
     Link_Eye_Model,
@@ -1267,6 +3598,16 @@ def register():
     bpy.types.Object.my_settings = bpy.props.PointerProperty(type=MySettings)
     bpy.types.Object.sliders = bpy.props.PointerProperty(type=SliderList)
     bpy.types.Scene.global_setting = bpy.props.PointerProperty(type=GlobalSettings)
+
+    if(prewarmModels not in bpy.app.handlers.load_post):
+        bpy.app.handlers.load_post.append(prewarmModels)
+
+    if(startFrameChange not in bpy.app.handlers.frame_change_pre):
+        bpy.app.handlers.frame_change_pre.append(startFrameChange)
+
+    if(refreshAnimatedHeads not in bpy.app.handlers.frame_change_post):
+        bpy.app.handlers.frame_change_post.append(refreshAnimatedHeads)
+
     print("EOS Interface Loaded")
 
 def unregister():
@@ -1274,6 +3615,15 @@ def unregister():
     for cls in reversed(classes):
         unregister_class(cls)             
 
+    if(prewarmModels in bpy.app.handlers.load_post):
+        bpy.app.handlers.load_post.remove(prewarmModels)
+
+    if(startFrameChange in bpy.app.handlers.frame_change_pre):
+        bpy.app.handlers.frame_change_pre.remove(startFrameChange)
+
+    if(refreshAnimatedHeads in bpy.app.handlers.frame_change_post):
+        bpy.app.handlers.frame_change_post.remove(refreshAnimatedHeads)
+
 if __name__ == "__main__":
     try:
         unregister()
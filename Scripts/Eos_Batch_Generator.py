@@ -0,0 +1,370 @@
+# Generate random heads without creating Blender objects, each sample is streamed straight to a PLY, OBJ or glTF file
+#
+#   blender -b --python Scripts/Eos_Batch_Generator.py -- --model sfm_shape_3448.bin --count 1000 --format ply --output faces
+#
+# Samples are drawn like Random Sliders (normal with the given standard deviations, clipped to the slider range)
+# Sample i always uses the seed (seed, i) so any sample can be regenerated on its own
+#
+# --workers N splits the samples into shards spread over N worker processes, each shard gets its own folder and a
+# manifest of the coefficients of its samples. Running the same command again only redoes the shards that didn't finish
+#
+# BLAS is pinned to one thread for the workers and the single process run alike, so the files don't depend on N.
+# The pin only works if numpy isn't loaded before the script, otherwise use --workers 1 to get the same files as a parallel run
+
+import sys
+import os
+import json
+import argparse
+import subprocess
+
+blasThreads = {"OMP_NUM_THREADS" : "1", "OPENBLAS_NUM_THREADS" : "1", "MKL_NUM_THREADS" : "1"}
+numpyPreloaded = "numpy" in sys.modules # BLAS reads its thread count when numpy is first imported
+
+if(__name__ == "__main__"): os.environ.update(blasThreads)
+
+import numpy as np
+import bpy
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import Eos_B_Plugin as plugin
+
+def getSampleGenerator(seed, index): # Random generator for one sample, independent of how many samples came before it
+    return np.random.default_rng((seed, index))
+
+def toColourBytes(colours): # Float colours (0 to 1) as 8 bit
+    return np.clip(np.rint(colours * 255), 0, 255).astype(np.uint8)
+
+class BatchTopology(): # Faces and uvs of the model, worked out once and shared by every sample
+
+    def __init__(self, evaluator):
+
+        self.vertexCount = evaluator.vertexCount
+        self.faces = np.asarray(evaluator.tvi, dtype = np.int64).reshape(-1, 3)
+        self.texcoords = evaluator.texcoords
+        self.hasColour = evaluator.colourBasis.rows == self.vertexCount * 3 # One colour per vertex, like the eos models
+
+        self.uvFaces = None # No uvs are written if the texcoords fit neither the uv faces nor the vertices
+
+        if(len(self.texcoords) != 0 and len(evaluator.tti) == len(evaluator.tvi)):
+            self.uvFaces = np.asarray(evaluator.tti, dtype = np.int64).reshape(-1, 3)
+        elif(len(self.texcoords) == self.vertexCount): # Models without uv faces (like the colourless sfm models) have one uv per vertex, as in refreshLoopData
+            self.uvFaces = self.faces
+
+class PlyWriter(): # Binary little endian PLY, the face block (indices and per face uvs) is encoded once
+
+    extension = ".ply"
+
+    def __init__(self, topology, folder):
+
+        self.topology = topology
+
+        vertexFields = [("x", "<f4"), ("y", "<f4"), ("z", "<f4")]
+        header = ["ply", "format binary_little_endian 1.0", "element vertex " + str(topology.vertexCount),
+                  "property float x", "property float y", "property float z"]
+
+        if(topology.hasColour):
+            vertexFields += [("red", "u1"), ("green", "u1"), ("blue", "u1")]
+            header += ["property uchar red", "property uchar green", "property uchar blue"]
+
+        faceFields = [("count", "u1"), ("vertices", "<i4", (3,))]
+        header += ["element face " + str(len(topology.faces)), "property list uchar int vertex_indices"]
+
+        if(topology.uvFaces is not None):
+            faceFields += [("uvCount", "u1"), ("uvs", "<f4", (6,))]
+            header += ["property list uchar float texcoord"]
+
+        self.header = ("\n".join(header) + "\nend_header\n").encode("ascii")
+        self.vertexType = np.dtype(vertexFields)
+
+        faces = np.zeros(len(topology.faces), dtype = np.dtype(faceFields))
+        faces["count"] = 3
+        faces["vertices"] = topology.faces
+
+        if(topology.uvFaces is not None):
+            faces["uvCount"] = 6
+            faces["uvs"] = topology.texcoords[topology.uvFaces].reshape(-1, 6)
+
+        self.faceBytes = faces.tobytes()
+
+    def write(self, path, sample):
+
+        vertices = np.empty(self.topology.vertexCount, dtype = self.vertexType)
+        vertices["x"], vertices["y"], vertices["z"] = sample.vertices[:, 0], sample.vertices[:, 1], sample.vertices[:, 2]
+
+        if(self.topology.hasColour):
+            colours = toColourBytes(sample.colors)
+            vertices["red"], vertices["green"], vertices["blue"] = colours[:, 0], colours[:, 1], colours[:, 2]
+
+        with open(path, "wb") as meshFile:
+            meshFile.write(self.header)
+            meshFile.write(vertices.tobytes())
+            meshFile.write(self.faceBytes)
+
+class ObjWriter(): # OBJ is text only, the uv and face lines are encoded once and each sample only formats its vertices
+
+    extension = ".obj"
+
+    def __init__(self, topology, folder):
+
+        self.topology = topology
+
+        lines = []
+
+        if(topology.uvFaces is not None):
+            lines += ["vt %.6f %.6f" % (u, v) for u, v in topology.texcoords]
+            lines += ["f %d/%d %d/%d %d/%d" % tuple(np.stack((face, uvFace), axis = 1).reshape(-1)) for face, uvFace in zip(topology.faces + 1, topology.uvFaces + 1)]
+        else:
+            lines += ["f %d %d %d" % tuple(face) for face in topology.faces + 1]
+
+        self.sharedBytes = ("\n".join(lines) + "\n").encode("ascii")
+        self.vertexFormat = "v %.6f %.6f %.6f %.6f %.6f %.6f\n" if topology.hasColour else "v %.6f %.6f %.6f\n" # Vertex colours are the common x y z r g b extension
+
+    def write(self, path, sample):
+
+        vertices = sample.vertices
+
+        if(self.topology.hasColour):
+            vertices = np.concatenate((vertices, np.clip(sample.colors, 0, 1)), axis = 1)
+
+        with open(path, "wb") as meshFile:
+            meshFile.write((self.vertexFormat * len(vertices) % tuple(vertices.reshape(-1))).encode("ascii"))
+            meshFile.write(self.sharedBytes)
+
+class GltfWriter(): # glTF with the indices and uvs in one shared topology.bin, each sample only has its own positions and colours
+
+    extension = ".gltf"
+    topologyName = "topology.bin"
+
+    def __init__(self, topology, folder):
+
+        self.topology = topology
+
+        corners = [topology.faces.reshape(-1)] # glTF has one index per vertex, so vertices with more than one uv are split
+        if(topology.uvFaces is not None): corners.append(topology.uvFaces.reshape(-1))
+
+        unique, indices = np.unique(np.stack(corners, axis = 1), axis = 0, return_inverse = True)
+
+        self.vertexSource = unique[:, 0] # Model vertex of every glTF vertex
+        indices = indices.reshape(-1).astype(np.uint32)
+
+        topologyBytes = indices.tobytes()
+        self.views = [{"buffer" : 0, "byteOffset" : 0, "byteLength" : len(topologyBytes), "target" : 34963}]
+        self.accessors = [{"bufferView" : 0, "componentType" : 5125, "count" : len(indices), "type" : "SCALAR"}]
+        self.attributes = {}
+
+        if(topology.uvFaces is not None):
+            uvs = topology.texcoords[unique[:, 1]] * np.array([1, -1], dtype = np.float32) + np.array([0, 1], dtype = np.float32) # glTF uvs start at the top
+            self.views.append({"buffer" : 0, "byteOffset" : len(topologyBytes), "byteLength" : uvs.nbytes, "target" : 34962})
+            self.accessors.append({"bufferView" : 1, "componentType" : 5126, "count" : len(uvs), "type" : "VEC2"})
+            self.attributes["TEXCOORD_0"] = 1
+            topologyBytes += uvs.astype(np.float32).tobytes()
+
+        self.topologyLength = len(topologyBytes)
+
+        with open(os.path.join(folder, self.topologyName), "wb") as topologyFile:
+            topologyFile.write(topologyBytes)
+
+    def write(self, path, sample):
+
+        positions = np.ascontiguousarray(sample.vertices[self.vertexSource], dtype = np.float32)
+        sampleBytes = positions.tobytes()
+
+        views = self.views + [{"buffer" : 1, "byteOffset" : 0, "byteLength" : positions.nbytes, "target" : 34962}]
+        accessors = self.accessors + [{"bufferView" : len(views) - 1, "componentType" : 5126, "count" : len(positions), "type" : "VEC3",
+                                       "min" : positions.min(axis = 0).tolist(), "max" : positions.max(axis = 0).tolist()}]
+        attributes = dict(self.attributes, POSITION = len(accessors) - 1)
+
+        if(self.topology.hasColour):
+            colours = np.ascontiguousarray(np.clip(sample.colors[self.vertexSource], 0, 1), dtype = np.float32)
+            views.append({"buffer" : 1, "byteOffset" : len(sampleBytes), "byteLength" : colours.nbytes, "target" : 34962})
+            accessors.append({"bufferView" : len(views) - 1, "componentType" : 5126, "count" : len(colours), "type" : "VEC3"})
+            attributes["COLOR_0"] = len(accessors) - 1
+            sampleBytes += colours.tobytes()
+
+        binaryName = os.path.splitext(os.path.basename(path))[0] + ".bin"
+
+        gltf = {"asset" : {"version" : "2.0", "generator" : "Eos Interface batch generator"},
+                "scene" : 0,
+                "scenes" : [{"nodes" : [0]}],
+                "nodes" : [{"mesh" : 0}],
+                "meshes" : [{"primitives" : [{"attributes" : attributes, "indices" : 0}]}],
+                "buffers" : [{"uri" : self.topologyName, "byteLength" : self.topologyLength}, {"uri" : binaryName, "byteLength" : len(sampleBytes)}],
+                "bufferViews" : views,
+                "accessors" : accessors}
+
+        with open(os.path.join(os.path.dirname(path), binaryName), "wb") as binaryFile:
+            binaryFile.write(sampleBytes)
+
+        with open(path, "w") as gltfFile:
+            json.dump(gltf, gltfFile)
+
+writers = {"ply" : PlyWriter, "obj" : ObjWriter, "gltf" : GltfWriter}
+
+def getComponentCounts(evaluator): # Shape, colour and expression coefficients the model takes
+    return (evaluator.shapeBasis.columnCount, evaluator.colourBasis.columnCount, evaluator.expressions.columnCount)
+
+def generateSamples(modelPath, blendshapePath, folder, count, start = 0, seed = 0, deviations = (1.0, 1.0, 1.0), fileFormat = "ply", prefix = "face"): # Write samples start to start + count - 1 one at a time so memory stays flat, yields each index, path and coefficients
+
+    loadedModel = plugin.modelRegistry.get(modelPath, blendshapePath)
+    evaluator = loadedModel.evaluator
+
+    os.makedirs(folder, exist_ok = True)
+
+    writer = writers[fileFormat](BatchTopology(evaluator), folder)
+    counts = getComponentCounts(evaluator)
+
+    for index in range(start, start + count):
+
+        coefficients = plugin.getRandomCoefficients(counts, deviations, getSampleGenerator(seed, index))
+        shape, colour, expression = np.split(coefficients, np.cumsum(counts)[:2])
+
+        sample = evaluator.drawSample(shape, expression, colour) # No key, nothing is kept between samples
+
+        path = os.path.join(folder, prefix + "_" + str(index).zfill(6) + writer.extension)
+        writer.write(path, sample)
+
+        yield index, path, (shape, colour, expression)
+
+def getArguments(): # Blender passes the script's own arguments after --
+
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+
+    parser = argparse.ArgumentParser(description = "Generate random heads from an eos model without creating Blender objects")
+    parser.add_argument("--model", required = True, help = "Eos model (.bin)")
+    parser.add_argument("--blendshapes", default = "", help = "Blendshape file for models without expressions")
+    parser.add_argument("--output", required = True, help = "Folder the samples are written to")
+    parser.add_argument("--count", type = int, default = 100, help = "Number of samples")
+    parser.add_argument("--start", type = int, default = 0, help = "Index of the first sample")
+    parser.add_argument("--seed", type = int, default = 0, help = "Seed, sample i always uses (seed, i)")
+    parser.add_argument("--shape-sd", type = float, default = 1.0, help = "Standard deviation for shape")
+    parser.add_argument("--colour-sd", type = float, default = 1.0, help = "Standard deviation for colour")
+    parser.add_argument("--expression-sd", type = float, default = 1.0, help = "Standard deviation for expressions")
+    parser.add_argument("--format", choices = sorted(writers), default = "ply", help = "Mesh file format")
+    parser.add_argument("--prefix", default = "face", help = "Start of every sample file name")
+    parser.add_argument("--workers", type = int, default = 0, help = "Worker processes for sharded generation (0 writes every sample in this process)")
+    parser.add_argument("--shard-size", type = int, default = 500, help = "Samples in each shard")
+    parser.add_argument("--worker", type = int, default = -1, help = argparse.SUPPRESS) # Set on the worker processes
+
+    return parser.parse_args(argv), argv
+
+def getDeviations(arguments):
+    return (arguments.shape_sd, arguments.colour_sd, arguments.expression_sd)
+
+def getShardCount(arguments):
+    return (arguments.count + arguments.shard_size - 1) // arguments.shard_size
+
+def getShardName(shard):
+    return "shard_" + str(shard).zfill(6)
+
+def runShard(arguments, shard): # Write one shard, its manifest only appears once every sample is written so a stopped shard is redone
+
+    first = arguments.start + shard * arguments.shard_size
+    count = min(arguments.shard_size, arguments.start + arguments.count - first)
+
+    folder = os.path.join(arguments.output, getShardName(shard))
+    manifestPath = folder + ".jsonl"
+
+    with open(manifestPath + ".part", "w") as manifest:
+
+        for index, path, (shape, colour, expression) in generateSamples(arguments.model, arguments.blendshapes, folder, count, first, arguments.seed, getDeviations(arguments), arguments.format, arguments.prefix):
+
+            record = {"index" : index, "seed" : [arguments.seed, index], "path" : os.path.relpath(path, arguments.output),
+                      "shape" : shape.tolist(), "colour" : colour.tolist(), "expression" : expression.tolist()}
+
+            manifest.write(json.dumps(record) + "\n")
+
+    os.replace(manifestPath + ".part", manifestPath)
+
+def runWorker(arguments): # Shards worker, worker + workers, ... that aren't finished yet, the model is loaded once for all of them
+
+    for shard in range(arguments.worker, getShardCount(arguments), arguments.workers):
+
+        if(os.path.isfile(os.path.join(arguments.output, getShardName(shard) + ".jsonl"))): continue # Finished before an interruption
+
+        runShard(arguments, shard)
+
+def getWorkerCommand(): # Blender reruns this script in background mode, plain python just reruns it
+
+    binaryPath = getattr(bpy.app, "binary_path", "")
+
+    if(binaryPath != "" and os.path.basename(binaryPath).lower().startswith("blender")):
+        return [binaryPath, "-b", "--factory-startup", "--python", os.path.abspath(__file__), "--"]
+
+    return [sys.executable, os.path.abspath(__file__), "--"]
+
+def checkRunSettings(arguments): # Resuming with different settings would mix two datasets
+
+    settings = {"model" : arguments.model, "blendshapes" : arguments.blendshapes, "count" : arguments.count, "start" : arguments.start, "seed" : arguments.seed,
+                "deviations" : list(getDeviations(arguments)), "format" : arguments.format, "prefix" : arguments.prefix, "shardSize" : arguments.shard_size}
+
+    settingsPath = os.path.join(arguments.output, "run.json")
+
+    if(os.path.isfile(settingsPath)):
+        with open(settingsPath) as settingsFile:
+            if(json.load(settingsFile) != settings): raise SystemExit("Output folder holds a run with different settings: " + settingsPath)
+        return
+
+    with open(settingsPath, "w") as settingsFile:
+        json.dump(settings, settingsFile, indent = 2)
+
+def mergeManifests(arguments): # Join the shard manifests in sample order, False if a shard is missing
+
+    shardCount = getShardCount(arguments)
+    missing = [shard for shard in range(0, shardCount) if not os.path.isfile(os.path.join(arguments.output, getShardName(shard) + ".jsonl"))]
+
+    if(len(missing) != 0):
+        print("Shards not finished:", ", ".join(str(shard) for shard in missing))
+        return False
+
+    manifestPath = os.path.join(arguments.output, "manifest.jsonl")
+
+    with open(manifestPath + ".part", "w") as manifest:
+        for shard in range(0, shardCount):
+            with open(os.path.join(arguments.output, getShardName(shard) + ".jsonl")) as shardManifest:
+                for line in shardManifest:
+                    manifest.write(line)
+
+    os.replace(manifestPath + ".part", manifestPath)
+
+    return True
+
+def runParallel(arguments, argv): # Spread the shards over worker processes, each with one BLAS thread so the workers don't fight over cores
+
+    os.makedirs(arguments.output, exist_ok = True)
+    checkRunSettings(arguments)
+
+    environment = dict(os.environ, **blasThreads)
+    command = getWorkerCommand() + argv
+
+    workers = [subprocess.Popen(command + ["--worker", str(worker)], env = environment) for worker in range(0, arguments.workers)]
+
+    failed = sum(worker.wait() != 0 for worker in workers)
+
+    if(failed != 0): print(failed, "workers failed, run the same command again to finish the missing shards")
+
+    return mergeManifests(arguments)
+
+def main():
+
+    arguments, argv = getArguments()
+
+    if(arguments.worker >= 0):
+        runWorker(arguments)
+        return
+
+    if(arguments.workers > 0):
+        if(runParallel(arguments, argv)): print("Wrote", arguments.count, "samples in", getShardCount(arguments), "shards to", arguments.output)
+        else: sys.exit(1)
+        return
+
+    if(numpyPreloaded): print("numpy was loaded before the script so BLAS may use several threads, use --workers 1 to get the same files as a parallel run")
+
+    written = 0
+
+    for index, path, coefficients in generateSamples(arguments.model, arguments.blendshapes, arguments.output, arguments.count, arguments.start, arguments.seed, getDeviations(arguments), arguments.format, arguments.prefix):
+        written += 1
+
+    print("Wrote", written, "samples to", arguments.output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# Export animated heads to point caches so render farm nodes need neither eos nor the plugin
+#
+#   blender -b performance.blend --python Scripts/Eos_Point_Cache_Export.py -- --object Head --output cache --format pc2
+#
+# Each head gets <name>.pc2 (or .mdd) with the positions of every frame, <name>.obj with its topology and uvs once,
+# and <name>_colours.npy with the 8 bit vertex colours of every frame (one frame if no colour slider is animated).
+# On the farm add a Mesh Cache modifier pointing at the point cache to the head (or to the imported OBJ, keeping its vertex order)
+
+import sys
+import os
+import argparse
+
+import bpy
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import Eos_B_Plugin as plugin
+
+def getArguments(): # Blender passes the script's own arguments after --
+
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+
+    parser = argparse.ArgumentParser(description = "Export the slider animation of heads to PC2 or MDD point caches")
+    parser.add_argument("--object", action = "append", default = [], help = "Head to export, can be given more than once (every head with animated sliders if left out)")
+    parser.add_argument("--output", required = True, help = "Folder the point caches are written to")
+    parser.add_argument("--format", choices = ["pc2", "mdd"], default = "pc2", help = "Point cache file format")
+    parser.add_argument("--start", type = int, default = None, help = "First frame (the scene's start frame if left out)")
+    parser.add_argument("--end", type = int, default = None, help = "Last frame (the scene's end frame if left out)")
+
+    return parser.parse_args(argv)
+
+def getHeads(names): # The named heads, or every head with animated sliders
+    if(len(names) != 0): return [bpy.data.objects[name] for name in names]
+    return [obj for obj in bpy.context.scene.objects if len(obj.sliders.sliderList) != 0 and len(plugin.getSliderCurves(obj)) != 0]
+
+def main():
+
+    arguments = getArguments()
+
+    if(not hasattr(bpy.types.Object, "sliders")): plugin.register() # The addon isn't enabled, its settings are needed to read the heads
+
+    scene = bpy.context.scene
+
+    frameStart = scene.frame_start if arguments.start is None else arguments.start
+    frameEnd = scene.frame_end if arguments.end is None else arguments.end
+
+    os.makedirs(arguments.output, exist_ok = True)
+
+    failed = 0
+
+    for obj in getHeads(arguments.object):
+        try:
+            paths = plugin.exportPointCache(obj, arguments.output, frameStart, frameEnd, arguments.format.upper(), scene.render.fps / scene.render.fps_base)
+        except ValueError as error: # Named object isn't a head
+            print("Skipped", obj.name + ":", error)
+            failed += 1
+            continue
+
+        print("Exported", obj.name, "frames", frameStart, "-", frameEnd, "to", ", ".join(paths))
+
+    if(failed != 0): sys.exit(1)
+
+if __name__ == "__main__":
+    main()